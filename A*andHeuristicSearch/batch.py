@@ -0,0 +1,157 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from puzzle import SlidingPuzzle
+from searchCore import AStar, AnytimeAStar, IDAStar, SearchLimitReached
+from oracle import OracleSolve
+
+#Accepts "4 1 3 2 6 8 7 5 0", "4,1,3,...", or a JSON list; blank lines and # comments are skipped
+def ParseInstance(line: str):
+    line = line.split("#", 1)[0].strip()
+    if not line:
+        return None
+    if line.startswith("["):
+        return tuple(json.loads(line))
+    return tuple(int(tok) for tok in line.replace(",", " ").split())
+
+#Lazily numbers the instances so the input is never held in memory. A line that does not
+#parse is passed on as its error, which becomes that instance's record
+def ReadInstances(stream):
+    index = 0
+    for line in stream:
+        try:
+            initial = ParseInstance(line)
+        except ValueError as e:
+            initial = ValueError(f"bad instance {line.strip()!r}: {e}")
+        if initial is None:
+            continue
+        yield index, initial
+        index += 1
+
+def Chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def ErrorRecord(index: int, error: Exception) -> dict:
+    return {"index": index, "status": "error", "error": f"{type(error).__name__}: {error}"}
+
+def SolveOne(index: int, initial, options: dict) -> dict:
+    if isinstance(initial, Exception):
+        return ErrorRecord(index, initial)
+    record = {"index": index, "initial": list(initial)}
+    startTime = time.perf_counter()
+    try:
+        width = math.isqrt(len(initial))
+        problem = SlidingPuzzle(initial, width=width, packed=options["packed"])
+        if options["algo"] == "oracle":
+            result = OracleSolve(problem)
+        elif options["algo"] == "anytime":
+            result = None
+            for result in AnytimeAStar(problem, options["heuristic"], options["weight"],
+                                       maxNodes=options["maxNodes"], timeLimit=options["timeLimit"]):
+                pass
+        elif options["algo"] == "idastar":
+            result = IDAStar(problem, options["heuristic"],
+                             maxNodes=options["maxNodes"], timeLimit=options["timeLimit"])
+        else:
+            result = AStar(problem, options["heuristic"], openList=options["openList"],
+                           maxNodes=options["maxNodes"], timeLimit=options["timeLimit"],
+                           weight=options["weight"])
+        if result is None:
+            record["status"] = "failed"
+        else:
+            record["status"] = "solved"
+            record.update(result)
+    except SearchLimitReached as e:
+        record["status"] = f"{e.reason}Limit"
+        record["nodesExpanded"] = e.nodesExpanded
+    except ValueError as e:
+        record["status"] = "invalid"
+        record["error"] = str(e)
+    except Exception as e:
+        #Any other failure (e.g. no pattern database for this board size) ends only this instance
+        record.update(ErrorRecord(index, e))
+    record["seconds"] = round(time.perf_counter() - startTime, 6)
+    return record
+
+def SolveChunk(chunk, options: dict):
+    return [SolveOne(index, initial, options) for index, initial in chunk]
+
+#Streams one JSON line per instance as chunks finish. At most workers * 2 chunks are
+#in flight, so memory stays flat however long the input is.
+def RunBatch(instances, out, options: dict, workers: int = None, chunkSize: int = 16) -> int:
+    written = 0
+    workers = workers or os.cpu_count() or 1
+    maxInFlight = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = {}   # future -> its chunk, to report every instance of a chunk that failed
+        for chunk in Chunks(instances, chunkSize):
+            chunks[pool.submit(SolveChunk, chunk, options)] = chunk
+            if len(chunks) < maxInFlight:
+                continue
+            done, _ = wait(chunks, return_when=FIRST_COMPLETED)
+            written += WriteResults(done, chunks, out)
+        while chunks:
+            done, _ = wait(chunks, return_when=FIRST_COMPLETED)
+            written += WriteResults(done, chunks, out)
+    return written
+
+#Writes and forgets the finished futures. A chunk whose task itself failed (a crashed
+#worker, an unpicklable result) gets an error record per instance instead of ending the batch.
+def WriteResults(futures, chunks: dict, out) -> int:
+    count = 0
+    for future in futures:
+        chunk = chunks.pop(future)
+        try:
+            records = future.result()
+        except Exception as e:
+            records = [ErrorRecord(index, e) for index, _ in chunk]
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    out.flush()
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve many sliding puzzle instances in parallel")
+    parser.add_argument("input", nargs="?", default="-", help="instance file, one per line ('-' for stdin)")
+    parser.add_argument("--output", default="-", help="JSONL output file ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="instances per task")
+    parser.add_argument("--algo", choices=["astar", "anytime", "idastar", "oracle"], default="astar")
+    parser.add_argument("--heuristic", choices=["h0", "h1", "h2", "pdb"], default="h2")
+    parser.add_argument("--open-list", choices=["heap", "bucket", "auto"], default="heap")
+    parser.add_argument("--weight", type=float, default=1, help="astar/anytime: f = g + weight * h")
+    parser.add_argument("--packed", action="store_true", help="search over packed-int states")
+    parser.add_argument("--max-nodes", type=int, default=None, help="per-instance expansion limit")
+    parser.add_argument("--time-limit", type=float, default=None, help="per-instance seconds")
+    args = parser.parse_args()
+
+    options = {
+        "algo": args.algo,
+        "heuristic": args.heuristic,
+        "openList": args.open_list,
+        "weight": args.weight,
+        "packed": args.packed,
+        "maxNodes": args.max_nodes,
+        "timeLimit": args.time_limit,
+    }
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        RunBatch(ReadInstances(source), out, options, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
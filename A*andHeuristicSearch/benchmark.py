@@ -0,0 +1,191 @@
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from oracle import GOAL, EightPuzzleOracle
+from puzzle import INVERSE, EightPuzzle, MoveTables
+from searchCore import AStar, IDAStar
+
+DEFAULT_DEPTHS = (8, 12, 16, 20, 24)
+DEFAULT_ENGINES = ("astar:h1", "astar:h2", "astar:pdb", "bucket:h2", "idastar:h2", "idastar:pdb")
+#Metrics compared against a baseline, and whether a larger value is an improvement
+COMPARED = (("nodesExpanded", False), ("wallP50", False), ("wallP90", False),
+            ("nodesPerSecond", True), ("peakBytes", False))
+
+#Seeded random walks from the goal; the oracle gives each visited state's exact optimal depth,
+#so every requested depth gets perDepth distinct instances whatever the walk lengths were.
+#Raises ValueError when a depth has fewer than perDepth states, or when maxWalks walks did not
+#find them all (the deepest states are rarely reached by a random walk)
+def GenerateInstances(depths, perDepth: int, seed: int, walkLength: int = 100,
+                      maxWalks: int = 20000) -> dict:
+    rng = random.Random(seed)
+    oracle = EightPuzzleOracle()
+    counts = oracle.DepthCounts()
+    for d in depths:
+        available = counts[d] if 0 <= d < len(counts) else 0
+        if available < perDepth:
+            raise ValueError(f"depth {d} has {available} states, {perDepth} requested "
+                             f"(8-puzzle depths run from 0 to {len(counts) - 1})")
+    moveNames, swaps = MoveTables(3)
+    buckets = {d: [] for d in depths}
+    walks = 0
+    while any(len(b) < perDepth for b in buckets.values()):
+        if walks == maxWalks:
+            short = sorted(d for d, b in buckets.items() if len(b) < perDepth)
+            raise ValueError(f"no {perDepth} distinct instances at depths {short} after "
+                             f"{maxWalks} walks; try a longer walkLength or fewer per depth")
+        walks += 1
+        tiles = list(GOAL)
+        blank = tiles.index(0)
+        lastAction = None
+        for _ in range(walkLength):
+            #Never undo the previous move, so walks drift away from the goal faster
+            action = rng.choice([a for a in moveNames[blank] if a != INVERSE.get(lastAction)])
+            swapIndex = swaps[blank][action]
+            tiles[blank], tiles[swapIndex] = tiles[swapIndex], 0
+            blank = swapIndex
+            lastAction = action
+            bucket = buckets.get(oracle.Distance(tiles))
+            if bucket is not None and len(bucket) < perDepth and tuple(tiles) not in bucket:
+                bucket.append(tuple(tiles))
+    return buckets
+
+#"algo:heuristic" where algo is astar (heap open list), bucket (bucket open list) or idastar
+def RunEngine(engine: str, instance, packed: bool) -> dict:
+    algo, heuristic = engine.split(":")
+    problem = EightPuzzle(instance, packed=packed)
+    startTime = time.perf_counter()
+    if algo == "idastar":
+        result = IDAStar(problem, heuristic)
+    elif algo in ("astar", "bucket"):
+        result = AStar(problem, heuristic, openList="bucket" if algo == "bucket" else "heap")
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+    result["seconds"] = time.perf_counter() - startTime
+    return result
+
+#tracemalloc slows the search down, so peak memory gets its own untimed run
+def PeakBytes(engine: str, instance, packed: bool) -> int:
+    tracemalloc.start()
+    try:
+        RunEngine(engine, instance, packed)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+#Nearest-rank percentile of an already sorted list: the smallest value with at least p
+#percent of the list at or below it
+def Percentile(values, p):
+    rank = math.ceil(p / 100 * len(values))
+    return values[min(len(values), max(1, rank)) - 1]
+
+def Summarize(times, expanded, peaks, costs, depth) -> dict:
+    times = sorted(times)
+    totalSeconds = sum(times)
+    return {
+        "instances": len(expanded),
+        "runs": len(times),
+        "nodesExpanded": sum(expanded) / len(expanded),
+        "nodesPerSecond": sum(expanded) * len(times) / len(expanded) / totalSeconds if totalSeconds else 0.0,
+        "wallMean": totalSeconds / len(times),
+        "wallP50": Percentile(times, 50),
+        "wallP90": Percentile(times, 90),
+        "wallP99": Percentile(times, 99),
+        "peakBytes": max(peaks),
+        "suboptimal": sum(1 for c in costs if c != depth),
+    }
+
+def RunBenchmark(engines, instances: dict, repeat: int = 3, warmup: int = 1, packed: bool = False,
+                 memory: bool = True, log=sys.stderr) -> dict:
+    results = {}
+    for engine in engines:
+        #Warmup loads pattern databases and settles caches before anything is timed
+        first = next(inst for bucket in instances.values() for inst in bucket)
+        for _ in range(warmup):
+            RunEngine(engine, first, packed)
+        for depth, bucket in instances.items():
+            times, expanded, peaks, costs = [], [], [], []
+            for instance in bucket:
+                for _ in range(repeat):
+                    result = RunEngine(engine, instance, packed)
+                    times.append(result["seconds"])
+                expanded.append(result["nodesExpanded"])
+                costs.append(result["cost"])
+                peaks.append(PeakBytes(engine, instance, packed) if memory else 0)
+            key = f"{engine}/depth-{depth}"
+            results[key] = Summarize(times, expanded, peaks, costs, depth)
+            print(f"{key}: p50 {results[key]['wallP50'] * 1000:.2f} ms, "
+                  f"{results[key]['nodesExpanded']:.0f} nodes", file=log)
+    return results
+
+#One line per metric that moved; changes beyond threshold are flagged. Returns the regressions.
+def Compare(current: dict, baseline: dict, threshold: float = 0.10, out=sys.stdout) -> list:
+    regressions = []
+    if current.get("instances") != baseline.get("instances"):
+        print("warning: instance sets differ from the baseline (seed or --per-depth changed?)", file=out)
+    for key in sorted(current["results"]):
+        old = baseline["results"].get(key)
+        if old is None:
+            print(f"{key}: new, no baseline", file=out)
+            continue
+        for metric, higherIsBetter in COMPARED:
+            before, after = old.get(metric), current["results"][key][metric]
+            if not before or before == after:
+                continue
+            change = (after - before) / before
+            worse = -change if higherIsBetter else change
+            flag = "REGRESSION" if worse > threshold else "improved" if worse < -threshold else ""
+            print(f"{key} {metric}: {before:.6g} -> {after:.6g} ({change:+.1%}) {flag}".rstrip(), file=out)
+            if flag == "REGRESSION":
+                regressions.append((key, metric, change))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seeded 8-puzzle benchmark stratified by optimal depth")
+    parser.add_argument("--engines", nargs="+", default=list(DEFAULT_ENGINES),
+                        help="algo:heuristic pairs; algo is astar, bucket or idastar")
+    parser.add_argument("--depths", nargs="+", type=int, default=list(DEFAULT_DEPTHS))
+    parser.add_argument("--per-depth", type=int, default=5, help="instances per depth")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per instance")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per engine")
+    parser.add_argument("--packed", action="store_true", help="search over packed-int states")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory runs")
+    parser.add_argument("--output", default="benchmark.json", help="results file ('-' for stdout)")
+    parser.add_argument("--baseline", default=None, help="earlier results file to diff against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change flagged by --baseline")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if --baseline finds a regression")
+    args = parser.parse_args()
+
+    instances = GenerateInstances(args.depths, args.per_depth, args.seed)
+    report = {
+        "meta": {
+            "seed": args.seed,
+            "perDepth": args.per_depth,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "packed": args.packed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "instances": {str(d): [list(inst) for inst in bucket] for d, bucket in instances.items()},
+        "results": RunBenchmark(args.engines, instances, args.repeat, args.warmup,
+                                args.packed, not args.no_memory),
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = Compare(report, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
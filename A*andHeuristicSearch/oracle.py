@@ -0,0 +1,111 @@
+import os
+from collections import Counter, deque
+from typing import Optional, Sequence, Tuple
+
+from patternDB import CACHE_DIR, MapCachedTable
+from puzzle import INVERSE, MoveTables, SlidingPuzzle
+
+#One byte per permutation rank: low 5 bits hold the optimal distance (8-puzzle max is 31),
+#the top bits hold the index of the move that starts an optimal path from that state
+MOVE_ORDER = ("Up", "Down", "Left", "Right")
+MOVE_ID = {name: i for i, name in enumerate(MOVE_ORDER)}
+DIST_MASK = 0x1F
+UNSEEN = 0xFF
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+FACTORIALS = (40320, 5040, 720, 120, 24, 6, 2, 1, 1)
+
+#Lehmer-code rank of a permutation of 0..8, a perfect hash into 9! slots
+def RankPermutation(state: Sequence[int]) -> int:
+    rank = 0
+    for i in range(8):
+        v = state[i]
+        smaller = 0
+        for w in state[i + 1:]:
+            if w < v:
+                smaller += 1
+        rank += smaller * FACTORIALS[i]
+    return rank
+
+#Backward BFS from the goal over all 181,440 reachable states
+def BuildOracleTable(goal: Tuple[int]) -> bytearray:
+    moveNames, swaps = MoveTables(3)
+    table = bytearray([UNSEEN]) * 362880
+    table[RankPermutation(goal)] = 0
+    queue = deque([(goal, 0)])
+
+    while queue:
+        state, d = queue.popleft()
+        index = state.index(0)
+        for action in moveNames[index]:
+            swapIndex = swaps[index][action]
+            nextState = list(state)
+            nextState[index], nextState[swapIndex] = nextState[swapIndex], nextState[index]
+            nextState = tuple(nextState)
+            rank = RankPermutation(nextState)
+            if table[rank] == UNSEEN:
+                #From nextState, undoing this move is one step closer to the goal
+                table[rank] = (MOVE_ID[INVERSE[action]] << 5) | (d + 1)
+                queue.append((nextState, d + 1))
+    return table
+
+class EightPuzzleOracle:
+    def __init__(self, goal: Tuple[int] = GOAL, cacheDir: str = CACHE_DIR):
+        self.goal = tuple(goal)
+        goalName = ".".join(map(str, goal))
+        self.path = os.path.join(cacheDir, f"oracle-3x3-{goalName}.bin")
+        self.table, self.buildSeconds = MapCachedTable(self.path, lambda: BuildOracleTable(self.goal))
+        self.built = self.buildSeconds > 0
+        self.fileSize = len(self.table)
+        self.moveNames, self.swaps = MoveTables(3)
+
+    #Optimal distance to the goal, or None if the state is not in the goal's half of the space
+    def Distance(self, state: Sequence[int]) -> Optional[int]:
+        entry = self.table[RankPermutation(state)]
+        return None if entry == UNSEEN else entry & DIST_MASK
+
+    #counts[d]: how many states are exactly d moves from the goal (index 0 is the goal itself)
+    def DepthCounts(self) -> list:
+        counts = [0] * (DIST_MASK + 1)
+        for entry, n in Counter(bytes(self.table)).items():
+            if entry != UNSEEN:
+                counts[entry & DIST_MASK] += n
+        while counts and not counts[-1]:
+            counts.pop()
+        return counts
+
+    #Follows the stored best moves down to the goal; one table read per step
+    def Solve(self, problem: SlidingPuzzle):
+        if problem.width != 3 or problem.goal != self.goal:
+            raise ValueError(f"Oracle was built for goal {self.goal}, not {problem.goal}")
+        tiles = list(problem.Decode(problem.InitialState()))
+        entry = self.table[RankPermutation(tiles)]
+        if entry == UNSEEN:
+            return None  # failure
+
+        path = []
+        blank = tiles.index(0)
+        while entry & DIST_MASK:
+            action = MOVE_ORDER[entry >> 5]
+            swapIndex = self.swaps[blank][action]
+            tiles[blank], tiles[swapIndex] = tiles[swapIndex], 0
+            blank = swapIndex
+            path.append(action)
+            entry = self.table[RankPermutation(tiles)]
+
+        return {
+            "solution": path,
+            "cost": len(path),
+            "depth": len(path),
+            "nodesExpanded": len(path),
+            "nodesGenerated": len(path),
+            "maxFrontierSize": 1,
+        }
+
+_oracles = {}
+
+#Solves an 8-puzzle with the shared per-process oracle, building the table on first use
+def OracleSolve(problem: SlidingPuzzle, cacheDir: str = CACHE_DIR):
+    key = (problem.goal, cacheDir)
+    if key not in _oracles:
+        _oracles[key] = EightPuzzleOracle(problem.goal, cacheDir)
+    return _oracles[key].Solve(problem)
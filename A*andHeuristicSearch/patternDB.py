@@ -0,0 +1,132 @@
+import mmap
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, List, Sequence, Tuple
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdbCache")
+UNSEEN = 0xFF
+
+#Default disjoint partition of the non-blank tiles for each board width
+DEFAULT_PATTERNS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15)),
+}
+
+#Perfect hash of k distinct cells chosen from n: mixed radix n, n-1, ..., n-k+1
+def RankPositions(positions: Sequence[int], n: int) -> int:
+    rank = 0
+    for i, p in enumerate(positions):
+        smaller = p
+        for q in positions[:i]:
+            if q < p:
+                smaller -= 1
+        rank = rank * (n - i) + smaller
+    return rank
+
+def PatternSize(k: int, n: int) -> int:
+    size = 1
+    for i in range(k):
+        size *= n - i
+    return size
+
+#Every board cell's neighbours, used to slide the blank in the abstract space
+def Neighbours(width: int) -> List[Tuple[int, ...]]:
+    neighbours = []
+    for index in range(width * width):
+        row, col = divmod(index, width)
+        cells = []
+        if row > 0: cells.append(index - width)
+        if row < width - 1: cells.append(index + width)
+        if col > 0: cells.append(index - 1)
+        if col < width - 1: cells.append(index + 1)
+        neighbours.append(tuple(cells))
+    return neighbours
+
+#Backward 0-1 BFS from the goal over (pattern tile cells, blank cell).
+#Only moves of pattern tiles cost 1, which is what makes disjoint databases additive.
+def BuildPatternTable(width: int, goal: Sequence[int], pattern: Sequence[int]) -> bytearray:
+    n = width * width
+    k = len(pattern)
+    neighbours = Neighbours(width)
+    goalIndex = {v: i for i, v in enumerate(goal)}
+
+    start = tuple(goalIndex[v] for v in pattern) + (goalIndex[0],)
+    dist = bytearray([UNSEEN]) * PatternSize(k + 1, n)
+    table = bytearray([UNSEEN]) * PatternSize(k, n)
+    dist[RankPositions(start, n)] = 0
+    queue = deque([(start, 0)])
+
+    while queue:
+        cells, d = queue.popleft()
+        if d > dist[RankPositions(cells, n)]:
+            continue
+        tileRank = RankPositions(cells[:k], n)
+        if d < table[tileRank]:
+            table[tileRank] = d
+
+        blank = cells[k]
+        for target in neighbours[blank]:
+            #Slide whatever sits on target into the blank
+            if target in cells[:k]:
+                slot = cells.index(target)
+                nextCells = cells[:slot] + (blank,) + cells[slot + 1:k] + (target,)
+                nextD = d + 1
+            else:
+                nextCells = cells[:k] + (target,)
+                nextD = d
+            nextRank = RankPositions(nextCells, n)
+            if nextD < dist[nextRank]:
+                dist[nextRank] = nextD
+                if nextD == d:
+                    queue.appendleft((nextCells, nextD))
+                else:
+                    queue.append((nextCells, nextD))
+
+    #Unreachable placements contribute nothing rather than a bogus 255
+    return bytearray(0 if v == UNSEEN else v for v in table)
+
+#Memory-maps a cached byte table, building and saving it first if the file is missing.
+#Returns the read-only map and the seconds spent building (0.0 when loaded from disk).
+def MapCachedTable(path: str, build: Callable[[], bytearray]) -> Tuple[mmap.mmap, float]:
+    buildSeconds = 0.0
+    if not os.path.exists(path):
+        startTime = time.perf_counter()
+        table = build()
+        buildSeconds = time.perf_counter() - startTime
+        #Write then rename so concurrent workers never map a half-written file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmpPath = f"{path}.{os.getpid()}.tmp"
+        with open(tmpPath, "wb") as f:
+            f.write(table)
+        os.replace(tmpPath, path)
+
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), buildSeconds
+
+class PatternDatabase:
+    def __init__(self, width: int, goal: Sequence[int], pattern: Sequence[int], cacheDir: str = CACHE_DIR):
+        self.width = width
+        self.n = width * width
+        self.pattern = tuple(pattern)
+        goalName = ".".join(map(str, goal))
+        tileName = ".".join(map(str, pattern))
+        self.path = os.path.join(cacheDir, f"pdb-{width}x{width}-{goalName}-{tileName}.bin")
+        self.table, self.buildSeconds = MapCachedTable(
+            self.path, lambda: BuildPatternTable(width, goal, pattern))
+        self.built = self.buildSeconds > 0
+        self.fileSize = len(self.table)
+
+    def Lookup(self, tileCells: Sequence[int]) -> int:
+        return self.table[RankPositions([tileCells[v] for v in self.pattern], self.n)]
+
+_loaded: Dict[tuple, List[PatternDatabase]] = {}
+
+#Loads (building on first use) the disjoint databases for a board; shared per process
+def LoadAdditivePDB(width: int, goal: Sequence[int], patterns=None, cacheDir: str = CACHE_DIR) -> List[PatternDatabase]:
+    if patterns is None:
+        patterns = DEFAULT_PATTERNS[width]
+    key = (width, tuple(goal), tuple(map(tuple, patterns)), cacheDir)
+    if key not in _loaded:
+        _loaded[key] = [PatternDatabase(width, goal, p, cacheDir) for p in patterns]
+    return _loaded[key]
@@ -1,64 +1,226 @@
-from typing import List, Tuple
-
-#Definition of State-Space and problem
-class EightPuzzle:
-    def __init__(self, initial: Tuple[int]):
-        self.initial = initial
-        self.goal = (1, 2, 3,
-                     4, 5, 6,
-                     7, 8, 0)  # solved state
-
-    #Random list of 0-8
-    def InitialState(self) -> Tuple[int]:
-        return self.initial
-
-    #Adds legal actions, no going outside of the 3x3
-    def Actions(self, state: Tuple[int]) -> List[str]:
-        actions = []
-        index = state.index(0)  # blank
-        row, col = divmod(index, 3)
-        if row > 0: actions.append("Up")
-        if row < 2: actions.append("Down")
-        if col > 0: actions.append("Left")
-        if col < 2: actions.append("Right")
-        return actions
+from typing import Dict, List, Tuple, Union
+from patternDB import LoadAdditivePDB
 
-    #Switches the tiles/numbers and makes new state
-    def Transition(self, state: Tuple[int], action: str) -> Tuple[int]:
-        index = state.index(0)
-        row, col = divmod(index, 3)
-        swapIndex = index
+BITS = 4  # bits per tile in the packed encoding, enough for boards up to 4x4
+TILE_MASK = (1 << BITS) - 1
+INVERSE = {"Up": "Down", "Down": "Up", "Left": "Right", "Right": "Left"}
+
+#Move tables per board width: legal (action, swapIndex) pairs for each blank position
+_moveTables: Dict[int, tuple] = {}
+
+def MoveTables(width: int):
+    if width not in _moveTables:
+        moves = []
+        for index in range(width * width):
+            row, col = divmod(index, width)
+            cellMoves = []
+            if row > 0: cellMoves.append(("Up", index - width))
+            if row < width - 1: cellMoves.append(("Down", index + width))
+            if col > 0: cellMoves.append(("Left", index - 1))
+            if col < width - 1: cellMoves.append(("Right", index + 1))
+            moves.append(tuple(cellMoves))
+        names = [[name for name, _ in cellMoves] for cellMoves in moves]
+        swaps = [dict(cellMoves) for cellMoves in moves]
+        _moveTables[width] = (names, swaps)
+    return _moveTables[width]
+
+#Packs a board tuple into one int: tile i in bits 4i..4i+3, blank index above them
+def Pack(state: Tuple[int]) -> int:
+    packed = 0
+    for i, v in enumerate(state):
+        packed |= v << (BITS * i)
+    return packed | (state.index(0) << (BITS * len(state)))
+
+def Unpack(packed: int, n: int = 9) -> Tuple[int]:
+    return tuple([(packed >> (BITS * i)) & TILE_MASK for i in range(n)])
+
+State = Union[Tuple[int], int]
+
+#Mutable board for depth-first engines that make and unmake moves in place
+class Board:
+    __slots__ = ("tiles", "blank")
+
+    def __init__(self, tiles: List[int]):
+        self.tiles = tiles
+        self.blank = tiles.index(0)
 
-        if action == "Up": swapIndex = (row - 1) * 3 + col
-        if action == "Down": swapIndex = (row + 1) * 3 + col
-        if action == "Left": swapIndex = row * 3 + (col - 1)
-        if action == "Right": swapIndex = row * 3 + (col + 1)
+#Definition of State-Space and problem for any width x width sliding puzzle
+class SlidingPuzzle:
+    def __init__(self, initial: Tuple[int], width: int = 3, packed: bool = False):
+        n = width * width
+        if sorted(initial) != list(range(n)):
+            raise ValueError(f"Initial state must be a permutation of 0..{n - 1}")
+        if packed and n - 1 > TILE_MASK:
+            raise ValueError(f"Packed states hold at most {TILE_MASK} tiles")
 
+        self.width = width
+        self.n = n
+        self.initial = tuple(initial)
+        self.goal = tuple(range(1, n)) + (0,)  # solved state
+        self.goalList = list(self.goal)
+        if not self.Solvable(self.initial):
+            raise ValueError(f"Unsolvable {width}x{width} instance: {self.initial}")
+
+        #With packed=True every state handed to the search is a small int instead of a tuple
+        self.packed = packed
+        self.blankShift = BITS * n
+        self.shifts = [BITS * i for i in range(n)]
+        self.goalKey = Pack(self.goal) if packed else self.goal
+        self.moveNames, self.swaps = MoveTables(width)
+
+        #Goal position of every tile, built once so heuristics never search the goal tuple
+        self.goalIndex = [0] * n
+        for i, v in enumerate(self.goal):
+            self.goalIndex[v] = i
+        #Per-tile cost of sitting at each position; the blank always costs 0
+        self.tileCost = {"h1": [[0] * n for _ in range(n)], "h2": [[0] * n for _ in range(n)]}
+        for v in range(1, n):
+            goalRow, goalCol = divmod(self.goalIndex[v], width)
+            for i in range(n):
+                curRow, curCol = divmod(i, width)
+                self.tileCost["h1"][v][i] = int(i != self.goalIndex[v])
+                self.tileCost["h2"][v][i] = abs(goalRow - curRow) + abs(goalCol - curCol)
+        #Variants AStar may update with HeuristicAfterMove instead of a full evaluation
+        self.incrementalHeuristics = ("h0", "h1", "h2")
+        self.patternDBs = None  # loaded on first "pdb" evaluation
+        #Unit step costs and integer heuristics, so AStar(openList="auto") can use buckets
+        self.integerCosts = True
+
+    #Inversion parity (plus the blank's row on even widths) is invariant under legal moves
+    def Parity(self, state: Tuple[int]) -> int:
+        tiles = [v for v in state if v != 0]
+        inversions = 0
+        for i, v in enumerate(tiles):
+            for w in tiles[i + 1:]:
+                if w < v:
+                    inversions += 1
+        if self.width % 2 == 0:
+            inversions += state.index(0) // self.width
+        return inversions % 2
+
+    def Solvable(self, state: Tuple[int]) -> bool:
+        return self.Parity(state) == self.Parity(self.goal)
+
+    def InitialState(self) -> State:
+        return Pack(self.initial) if self.packed else self.initial
+
+    #Converts a search state back to the tuple form used at the API boundary
+    def Decode(self, state: State) -> Tuple[int]:
+        return Unpack(state, self.n) if self.packed else state
+
+    #Adds legal actions, no going outside of the board
+    def Actions(self, state: State) -> List[str]:
+        if self.packed:
+            return self.moveNames[state >> self.blankShift]
+        return self.moveNames[state.index(0)]
+
+    #Switches the tiles/numbers and makes new state
+    def Transition(self, state: State, action: str) -> State:
+        if self.packed:
+            shifts = self.shifts
+            index = state >> self.blankShift
+            swapIndex = self.swaps[index][action]
+            tile = (state >> shifts[swapIndex]) & TILE_MASK
+            #Tile slides into the blank's nibble, blank index moves to swapIndex
+            return (state + (tile << shifts[index]) - (tile << shifts[swapIndex])
+                    + ((swapIndex - index) << self.blankShift))
+
+        index = state.index(0)
+        swapIndex = self.swaps[index][action]
         newState = list(state)
         newState[index], newState[swapIndex] = newState[swapIndex], newState[index]
         return tuple(newState)
 
     #Checks to see if Goal State is achieved.
-    def GoalTest(self, state: Tuple[int]) -> bool:
-        return state == self.goal
+    def GoalTest(self, state: State) -> bool:
+        return state == self.goalKey
 
     #Each step will only ever cost 1.
-    def StepCost(self, state: Tuple[int], action: str, nextState: Tuple[int]) -> int:
+    def StepCost(self, state: State, action: str, nextState: State) -> int:
         return 1
 
     # --- Heuristics ---
-    def Heuristic(self, state: Tuple[int], variant="h0") -> int:
+    def Heuristic(self, state: State, variant="h0") -> int:
+        if variant == "h0":  # UCS baseline
+            return 0
+        return self.TileHeuristic(self.Decode(state), variant)
+
+    #Full evaluation over a decoded tile sequence (tuple or Board.tiles)
+    def TileHeuristic(self, tiles, variant="h0") -> int:
         if variant == "h0":  # UCS baseline
             return 0
-        elif variant == "h1":  # Misplaced tiles
-            return sum(1 for i, v in enumerate(state) if v != 0 and v != self.goal[i])
-        elif variant == "h2":  # Manhattan distance
-            dist = 0
-            for i, v in enumerate(state):
-                if v == 0: continue
-                goalRow, goalCol = divmod(self.goal.index(v), 3)
-                curRow, curCol = divmod(i, 3)
-                dist += abs(goalRow - curRow) + abs(goalCol - curCol)
-            return dist
+        elif variant == "h1" or variant == "h2":  # Misplaced tiles / Manhattan distance
+            cost = self.tileCost[variant]
+            return sum(cost[v][i] for i, v in enumerate(tiles))
+        elif variant == "pdb":  # Disjoint additive pattern databases
+            if self.patternDBs is None:
+                self.patternDBs = LoadAdditivePDB(self.width, self.goal)
+            tileCells = [0] * self.n
+            for i, v in enumerate(tiles):
+                tileCells[v] = i
+            return sum(db.Lookup(tileCells) for db in self.patternDBs)
         else:
             raise ValueError(f"Unknown heuristic: {variant}")
+
+    #Position of the blank, read once per expansion and handed to HeuristicAfterMove
+    def Blank(self, state: State) -> int:
+        if self.packed:
+            return state >> self.blankShift
+        return state.index(0)
+
+    #O(1) update: a move only relocates one tile, from the child's blank square to the parent's
+    def HeuristicAfterMove(self, parentH: int, blank: int, action: str, nextState: State, variant="h0") -> int:
+        if variant == "h0":
+            return 0
+        swapIndex = self.swaps[blank][action]
+        if self.packed:
+            tile = (nextState >> self.shifts[blank]) & TILE_MASK
+        else:
+            tile = nextState[blank]
+        cost = self.tileCost[variant][tile]
+        return parentH - cost[swapIndex] + cost[blank]
+
+    # --- In-place moves for IDAStar ---
+    def NewBoard(self, state: State) -> Board:
+        return Board(list(self.Decode(state)))
+
+    def BoardActions(self, board: Board) -> List[str]:
+        return self.moveNames[board.blank]
+
+    def BoardGoalTest(self, board: Board) -> bool:
+        return board.tiles == self.goalList
+
+    def BoardHeuristic(self, board: Board, variant="h0") -> int:
+        return self.TileHeuristic(board.tiles, variant)
+
+    #Slides a tile into the blank in place and returns the child's h
+    def MakeMove(self, board: Board, action: str, h: int, variant="h0") -> int:
+        tiles = board.tiles
+        index = board.blank
+        swapIndex = self.swaps[index][action]
+        tile = tiles[swapIndex]
+        tiles[index] = tile
+        tiles[swapIndex] = 0
+        board.blank = swapIndex
+        if variant in self.incrementalHeuristics:
+            if variant == "h0":
+                return 0
+            cost = self.tileCost[variant][tile]
+            return h - cost[swapIndex] + cost[index]
+        return self.BoardHeuristic(board, variant)
+
+    def UnmakeMove(self, board: Board, action: str) -> None:
+        tiles = board.tiles
+        index = board.blank
+        swapIndex = self.swaps[index][INVERSE[action]]
+        tiles[index] = tiles[swapIndex]
+        tiles[swapIndex] = 0
+        board.blank = swapIndex
+
+    def InverseAction(self, action: str) -> str:
+        return INVERSE[action]
+
+#The classic 3x3 instance
+class EightPuzzle(SlidingPuzzle):
+    def __init__(self, initial: Tuple[int], packed: bool = False):
+        super().__init__(initial, width=3, packed=packed)
@@ -1,5 +1,9 @@
+import argparse
+import os
 from puzzle import EightPuzzle
-from searchCore import AStar
+from searchCore import AStar, AnytimeAStar, IDAStar, NormalizeWeight, SearchLimitReached
+from oracle import OracleSolve
+from searchObserver import SearchObserver
 
 def printResult(result):
     print(f"Solution: {', '.join(result['solution'])}")
@@ -8,17 +12,72 @@ def printResult(result):
     print(f"Nodes Expanded: {result['nodesExpanded']}")
     print(f"Nodes Generated: {result['nodesGenerated']}")
     print(f"Max Frontier Size: {result['maxFrontierSize']}")
+    if result.get("suboptimalityBound", 1) != 1:
+        print(f"Suboptimality Bound: {result['suboptimalityBound']:.3f}")
     print()  # blank line for readability
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--packed", action="store_true", help="search over packed-int states")
+    parser.add_argument("--heuristics", nargs="+", default=["h0", "h1", "h2"],
+                        choices=["h0", "h1", "h2", "pdb"])
+    parser.add_argument("--algo", choices=["astar", "anytime", "idastar", "oracle"], default="astar")
+    parser.add_argument("--open-list", choices=["heap", "bucket", "auto"], default="heap",
+                        help="A* frontier: binary heap or integer f buckets")
+    parser.add_argument("--weight", type=float, default=1,
+                        help="astar/anytime: f = g + weight * h, cost within weight x optimal")
+    parser.add_argument("--time-limit", type=float, default=None, help="anytime: seconds to keep improving")
+    parser.add_argument("--profile", default=None,
+                        help="A*: write per-phase timings as JSON, one file per heuristic (profile-h2.json)")
+    args = parser.parse_args()
+    try:
+        NormalizeWeight(args.weight)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.open_list == "bucket" and not args.weight.is_integer():
+        parser.error("--open-list bucket needs an integer --weight")
+
     # Example unsolved state
     initialState = ( 4, 1, 3,
                      2, 6, 8,
                      7, 5, 0)
 
-    problem = EightPuzzle(initialState)
+    problem = EightPuzzle(initialState, packed=args.packed)
+
+    if args.algo == "oracle":
+        print("\nLooking up the 8-puzzle oracle...")
+        printResult(OracleSolve(problem))
+        raise SystemExit
 
-    for h in ["h0", "h1", "h2"]:
-        print(f"\nRunning A* with {h}...")
-        result = AStar(problem, heuristicVariant=h)
+    expanded = {}
+    for h in args.heuristics:
+        if args.algo == "anytime":
+            print(f"\nRunning anytime A* with {h}, weight {args.weight}...")
+            try:
+                for result in AnytimeAStar(problem, h, args.weight, timeLimit=args.time_limit):
+                    print(f"Cost {result['cost']} within {result['suboptimalityBound']:.3f}x optimal "
+                          f"after {result['nodesExpanded']} expansions")
+            except SearchLimitReached as e:
+                #Only raised before the first solution; later the incumbent is yielded instead
+                print(f"No solution found: {e}\n")
+                continue
+        elif args.algo == "idastar":
+            print(f"\nRunning IDA* with {h}...")
+            result = IDAStar(problem, heuristicVariant=h)
+        else:
+            print(f"\nRunning A* with {h}...")
+            observer = SearchObserver() if args.profile else None
+            result = AStar(problem, heuristicVariant=h, openList=args.open_list, observer=observer,
+                           weight=args.weight)
+            if observer is not None:
+                root, ext = os.path.splitext(args.profile)
+                observer.to_json(f"{root}-{h}{ext or '.json'}")
         printResult(result)
+        expanded[h] = result["nodesExpanded"]
+
+    if problem.patternDBs is not None:
+        for db in problem.patternDBs:
+            source = f"built in {db.buildSeconds:.2f}s" if db.built else "loaded from cache"
+            print(f"PDB {db.pattern}: {source}, {db.fileSize} bytes ({db.path})")
+        if "h2" in expanded and "pdb" in expanded:
+            print(f"Nodes expanded pdb vs h2: {expanded['pdb']} vs {expanded['h2']}")
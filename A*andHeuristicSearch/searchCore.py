@@ -1,19 +1,208 @@
 import heapq
+import time
+from array import array
 
-def AStar(threeByThree, heuristicVariant="h0"):
+#Raised when a search runs past its node or time budget
+class SearchLimitReached(Exception):
+    def __init__(self, reason: str, nodesExpanded: int):
+        super().__init__(f"{reason} limit reached after {nodesExpanded} expansions")
+        self.reason = reason
+        self.nodesExpanded = nodesExpanded
+
+#Per-search node and wall-clock budget; the clock is only read every 1024 expansions
+class SearchLimits:
+    def __init__(self, maxNodes=None, timeLimit=None):
+        self.maxNodes = maxNodes
+        self.deadline = time.perf_counter() + timeLimit if timeLimit is not None else None
+
+    def Check(self, nodesExpanded: int):
+        if self.maxNodes is not None and nodesExpanded > self.maxNodes:
+            raise SearchLimitReached("node", nodesExpanded)
+        if self.deadline is not None and not nodesExpanded & 1023 and time.perf_counter() > self.deadline:
+            raise SearchLimitReached("time", nodesExpanded)
+
+def MakeLimits(maxNodes=None, timeLimit=None):
+    if maxNodes is None and timeLimit is None:
+        return None
+    return SearchLimits(maxNodes, timeLimit)
+
+#Stores search nodes as parallel arrays: each node only knows its parent and the action that made it
+class NodeArena:
+    def __init__(self):
+        self.parents = array("l")
+        self.actions = array("H")
+        self.actionIds = {}
+        self.actionNames = []
+
+    def Add(self, parent: int, action) -> int:
+        actionId = self.actionIds.get(action)
+        if actionId is None:
+            actionId = len(self.actionNames)
+            self.actionIds[action] = actionId
+            self.actionNames.append(action)
+        self.parents.append(parent)
+        self.actions.append(actionId)
+        return len(self.parents) - 1
+
+    #Walks parent pointers back to the root, done once when the goal is popped
+    def Path(self, node: int) -> list:
+        path = []
+        while self.parents[node] >= 0:
+            path.append(self.actionNames[self.actions[node]])
+            node = self.parents[node]
+        path.reverse()
+        return path
+
+#Binary-heap open list ordered on (f, g, state), works for any comparable costs
+class HeapQueue:
+    def __init__(self):
+        self.heap = []
+
+    def Push(self, f, g, state, node):
+        heapq.heappush(self.heap, (f, g, state, node))
+
+    def Pop(self):
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+#Open list for integer f and g: buckets[f] holds LIFO stacks, so push and pop are O(1).
+#With preferHighG each f bucket is split into per-g stacks and the deepest g pops first.
+class BucketQueue:
+    def __init__(self, preferHighG: bool = True):
+        self.preferHighG = preferHighG
+        self.buckets = []
+        self.minF = 0
+        self.size = 0
+
+    def Push(self, f: int, g: int, state, node: int):
+        buckets = self.buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        if self.preferHighG:
+            stacks = buckets[f]
+            while len(stacks) <= g:
+                stacks.append([])
+            stacks[g].append((state, node))
+        else:
+            buckets[f].append((g, state, node))
+        if f < self.minF:
+            self.minF = f
+        self.size += 1
+
+    def Pop(self):
+        buckets = self.buckets
+        while not buckets[self.minF]:
+            self.minF += 1
+        f = self.minF
+        self.size -= 1
+        if self.preferHighG:
+            stacks = buckets[f]
+            g = len(stacks) - 1
+            state, node = stacks[g].pop()
+            #Drop emptied top-g stacks so the next pop finds the deepest non-empty one directly
+            while stacks and not stacks[-1]:
+                stacks.pop()
+            return f, g, state, node
+        g, state, node = buckets[f].pop()
+        return f, g, state, node
+
+    def __len__(self):
+        return self.size
+
+#"heap" is the general-purpose default; "bucket" needs integer step costs and heuristics,
+#and "auto" picks it only for problems that declare integerCosts
+def OpenList(problem, openList="heap", preferHighG=True):
+    if openList == "auto":
+        openList = "bucket" if getattr(problem, "integerCosts", False) else "heap"
+    if openList == "bucket":
+        return BucketQueue(preferHighG)
+    if openList == "heap":
+        return HeapQueue()
+    raise ValueError(f"Unknown open list: {openList}")
+
+#Times a problem's methods into the observer's phases; anything else passes straight through
+class ObservedProblem:
+    PHASES = {
+        "Actions": "successors", "Transition": "successors", "StepCost": "successors",
+        "Heuristic": "heuristic", "HeuristicAfterMove": "heuristic", "Blank": "heuristic",
+        "GoalTest": "goal",
+    }
+
+    def __init__(self, problem, observer):
+        self.problem = problem
+        for name, phase in self.PHASES.items():
+            if hasattr(problem, name):
+                setattr(self, name, observer.timed(phase, getattr(problem, name)))
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+#Wraps the open list so Push/Pop count towards the "frontier" phase
+class ObservedOpenList:
+    def __init__(self, openList, observer):
+        self.openList = openList
+        self.Push = observer.timed("frontier", openList.Push)
+        self.Pop = observer.timed("frontier", openList.Pop)
+
+    def __len__(self):
+        return len(self.openList)
+
+#Whole-number weights stay ints so f keeps fitting the bucket open list
+def NormalizeWeight(weight):
+    if weight < 1:
+        raise ValueError(f"Weight must be at least 1, got {weight}")
+    return int(weight) if float(weight).is_integer() else weight
+
+#With an observer, the problem and data structures are swapped for timed wrappers and the
+#hooks fire per node; without one the loop runs exactly as before.
+#weight > 1 runs weighted A* (f = g + weight * h): with an admissible, consistent heuristic
+#the solution costs at most weight times the optimum, reported as suboptimalityBound.
+def AStar(threeByThree, heuristicVariant="h0", openList="heap", preferHighG=True,
+          maxNodes=None, timeLimit=None, observer=None, weight=1):
+    weight = NormalizeWeight(weight)
+    if not isinstance(weight, int):
+        if openList == "bucket":
+            raise ValueError("The bucket open list needs an integer weight")
+        openList = "heap"
+    limits = MakeLimits(maxNodes, timeLimit)
+    if observer is not None:
+        observer.start("astar")
+        threeByThree = ObservedProblem(threeByThree, observer)
+    try:
+        return _AStar(threeByThree, heuristicVariant, openList, preferHighG, limits, observer, weight)
+    finally:
+        if observer is not None:
+            observer.finish()
+
+def _AStar(threeByThree, heuristicVariant, openList, preferHighG, limits, observer, weight):
     initial = threeByThree.InitialState()
-    frontier = [(threeByThree.Heuristic(initial, heuristicVariant), 0, initial, [])]
-    bestG = {initial: 0} #Best path based on cost, if cost is all uniform, than first quickest path
+    arena = NodeArena()
+    root = arena.Add(-1, None)
+    #Problems that can update h from the parent's value skip the full evaluation per child
+    incremental = heuristicVariant in getattr(threeByThree, "incrementalHeuristics", ())
+    frontier = OpenList(threeByThree, openList, preferHighG)
+    bestG = {} #Best path based on cost, if cost is all uniform, than first quickest path
     explored = set()
+    if observer is not None:
+        frontier = ObservedOpenList(frontier, observer)
+        bestG = observer.timedDict()
+        explored = observer.timedSet()
+    frontier.Push(weight * threeByThree.Heuristic(initial, heuristicVariant), 0, initial, root)
+    bestG[initial] = 0
 
     nodesExpanded = 0
     nodesGenerated = 0
     maxFrontierSize = 1
 
     while frontier:
-        f, g, state, path = heapq.heappop(frontier)
+        f, g, state, node = frontier.Pop()
 
         if threeByThree.GoalTest(state):
+            path = arena.Path(node)
+            if observer is not None:
+                observer.on_goal(state, path)
             return {
                 "solution": path,
                 "cost": g,
@@ -21,24 +210,180 @@ def AStar(threeByThree, heuristicVariant="h0"):
                 "nodesExpanded": nodesExpanded,
                 "nodesGenerated": nodesGenerated,
                 "maxFrontierSize": maxFrontierSize,
+                "suboptimalityBound": weight,
             }
 
         if state in explored:
             continue
         explored.add(state)
         nodesExpanded += 1
+        if observer is not None:
+            observer.on_expand(state)
+        if limits is not None:
+            limits.Check(nodesExpanded)
+        #Incremental heuristics are integers, so rounding recovers h exactly from a weighted f
+        parentH = f - g if weight == 1 else round((f - g) / weight)
+        if incremental:
+            blank = threeByThree.Blank(state)
 
         #Expands tree based on available actions
         for action in threeByThree.Actions(state):
             nextState = threeByThree.Transition(state, action)
             newG = g + threeByThree.StepCost(state, action, nextState)
-            newF = newG + threeByThree.Heuristic(nextState, heuristicVariant)
+            if incremental:
+                newF = newG + weight * threeByThree.HeuristicAfterMove(parentH, blank, action, nextState, heuristicVariant)
+            else:
+                newF = newG + weight * threeByThree.Heuristic(nextState, heuristicVariant)
 
             #If new path isn't more cost effective, cut off
             if nextState not in bestG or newG < bestG[nextState]:
                 bestG[nextState] = newG
                 nodesGenerated += 1
-                heapq.heappush(frontier, (newF, newG, nextState, path + [action]))
+                if observer is not None:
+                    observer.on_generate(state, action, nextState)
+                frontier.Push(newF, newG, nextState, arena.Add(node, action))
                 maxFrontierSize = max(maxFrontierSize, len(frontier))
 
     return None  # failure
+
+#Anytime weighted A*: search with f = g + weight * h, yield the first solution, then keep
+#expanding (reopening states reached more cheaply and pruning nodes whose g + h cannot beat
+#the incumbent) and yield every cheaper solution found. Each result's suboptimalityBound is
+#incumbent cost / lowest g + h left open, which reaches 1.0 once the open list is exhausted.
+#When the node or time budget runs out the incumbent is yielded once more with the tightest
+#bound proven, so the last result yielded is always the final answer.
+def AnytimeAStar(problem, heuristicVariant="h0", weight=3, maxNodes=None, timeLimit=None):
+    weight = NormalizeWeight(weight)
+    limits = MakeLimits(maxNodes, timeLimit)
+    incremental = heuristicVariant in getattr(problem, "incrementalHeuristics", ())
+    initial = problem.InitialState()
+    arena = NodeArena()
+    h0 = problem.Heuristic(initial, heuristicVariant)
+    #(f, g, state, node, h): h rides along for the lower bound and incremental updates
+    frontier = [(weight * h0, 0, initial, arena.Add(-1, None), h0)]
+    bestG = {initial: 0}
+
+    incumbent = None
+    lastBound = None
+    nodesExpanded = 0
+    nodesGenerated = 0
+    maxFrontierSize = 1
+
+    def Result(bound):
+        nonlocal lastBound
+        lastBound = bound
+        return dict(incumbent, nodesExpanded=nodesExpanded, nodesGenerated=nodesGenerated,
+                    maxFrontierSize=maxFrontierSize, suboptimalityBound=bound)
+
+    def Bound():
+        cost = incumbent["cost"]
+        lowest = min((g + h for _, g, state, _, h in frontier if g == bestG[state] and g + h < cost),
+                     default=cost)
+        return cost / lowest if lowest else 1.0
+
+    try:
+        while frontier:
+            f, g, state, node, h = heapq.heappop(frontier)
+            if g > bestG[state]:
+                continue  # stale entry, a cheaper path was pushed since
+            if incumbent is not None and g + h >= incumbent["cost"]:
+                continue  # cannot beat the incumbent
+
+            if problem.GoalTest(state):
+                path = arena.Path(node)
+                incumbent = {"solution": path, "cost": g, "depth": len(path)}
+                yield Result(Bound())
+                continue
+
+            nodesExpanded += 1
+            if limits is not None:
+                try:
+                    limits.Check(nodesExpanded)
+                except SearchLimitReached:
+                    #The node is still open, so the final Bound() has to see it
+                    heapq.heappush(frontier, (f, g, state, node, h))
+                    raise
+            if incremental:
+                blank = problem.Blank(state)
+            for action in problem.Actions(state):
+                nextState = problem.Transition(state, action)
+                newG = g + problem.StepCost(state, action, nextState)
+                if nextState in bestG and newG >= bestG[nextState]:
+                    continue
+                if incremental:
+                    newH = problem.HeuristicAfterMove(h, blank, action, nextState, heuristicVariant)
+                else:
+                    newH = problem.Heuristic(nextState, heuristicVariant)
+                if incumbent is not None and newG + newH >= incumbent["cost"]:
+                    continue
+                bestG[nextState] = newG
+                nodesGenerated += 1
+                heapq.heappush(frontier, (newG + weight * newH, newG, nextState, arena.Add(node, action), newH))
+                maxFrontierSize = max(maxFrontierSize, len(frontier))
+    except SearchLimitReached:
+        if incumbent is None:
+            raise
+        bound = Bound()
+        if bound < lastBound:
+            yield Result(bound)
+        return
+
+    if incumbent is not None and lastBound != 1.0:
+        yield Result(1.0)
+
+#Iterative-deepening A*: memory is linear in depth because only the current path is kept,
+#and the problem's board is changed in place with MakeMove/UnmakeMove instead of copied
+def IDAStar(problem, heuristicVariant="h0", maxNodes=None, timeLimit=None):
+    limits = MakeLimits(maxNodes, timeLimit)
+    board = problem.NewBoard(problem.InitialState())
+    path = []
+    found = []
+    nodesExpanded = 0
+    nodesGenerated = 0
+    maxFrontierSize = 1
+
+    def Search(g, h, lastAction, bound):
+        nonlocal nodesExpanded, nodesGenerated, maxFrontierSize
+        f = g + h
+        if f > bound:
+            return f
+        if problem.BoardGoalTest(board):
+            found.append(g)
+            return f
+        nodesExpanded += 1
+        maxFrontierSize = max(maxFrontierSize, len(path) + 1)
+        if limits is not None:
+            limits.Check(nodesExpanded)
+
+        nextBound = float("inf")
+        undo = problem.InverseAction(lastAction) if lastAction is not None else None
+        for action in problem.BoardActions(board):
+            #Never undo the move that got us here
+            if action == undo:
+                continue
+            cost = problem.StepCost(board, action, board)
+            childH = problem.MakeMove(board, action, h, heuristicVariant)
+            nodesGenerated += 1
+            path.append(action)
+            t = Search(g + cost, childH, action, bound)
+            if found:
+                return t
+            path.pop()
+            problem.UnmakeMove(board, action)
+            nextBound = min(nextBound, t)
+        return nextBound
+
+    bound = problem.BoardHeuristic(board, heuristicVariant)
+    while True:
+        bound = Search(0, problem.BoardHeuristic(board, heuristicVariant), None, bound)
+        if found:
+            return {
+                "solution": path,
+                "cost": found[0],
+                "depth": len(path),
+                "nodesExpanded": nodesExpanded,
+                "nodesGenerated": nodesGenerated,
+                "maxFrontierSize": maxFrontierSize,
+            }
+        if bound == float("inf"):
+            return None  # failure
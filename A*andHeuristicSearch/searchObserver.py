@@ -0,0 +1,119 @@
+import json
+import time
+from collections import defaultdict
+
+#Callbacks and cumulative per-phase timers for the search engines. Pass an instance as
+#observer= to AStar; it is only instrumented when one is given, so plain searches keep the
+#fast path. Override on_expand/on_generate/on_goal for custom hooks and call super() to keep
+#the counters. WolfGoatCabbage/searchObserver.py gives bfs/ids the same hooks and export;
+#each copy only carries the timed containers its own engines use.
+class SearchObserver:
+    def __init__(self):
+        self.engine = None
+        self.phaseSeconds = defaultdict(float)
+        self.phaseCalls = defaultdict(int)
+        self.counts = {"expand": 0, "generate": 0, "goal": 0}
+        self.totalSeconds = 0.0
+        self._startTime = None
+
+    # --- hooks ---
+    def on_expand(self, state):
+        self.counts["expand"] += 1
+
+    def on_generate(self, state, action, nextState):
+        self.counts["generate"] += 1
+
+    def on_goal(self, state, path):
+        self.counts["goal"] += 1
+
+    # --- timing ---
+    def start(self, engine):
+        self.engine = engine
+        self._startTime = time.perf_counter()
+
+    def finish(self):
+        if self._startTime is not None:
+            self.totalSeconds += time.perf_counter() - self._startTime
+            self._startTime = None
+
+    #Wraps fn so every call adds its duration to phase
+    def timed(self, phase, fn):
+        clock, record = _clocked(self, phase)
+        def wrapper(*args):
+            t = clock()
+            try:
+                return fn(*args)
+            finally:
+                record(t)
+        return wrapper
+
+    def timedSet(self, phase="duplicates"):
+        return _TimedSet(self, phase)
+
+    def timedDict(self, phase="duplicates"):
+        return _TimedDict(self, phase)
+
+    # --- export ---
+    def to_dict(self):
+        measured = sum(self.phaseSeconds.values())
+        return {
+            "engine": self.engine,
+            "totalSeconds": self.totalSeconds,
+            "nodesPerSecond": self.counts["expand"] / self.totalSeconds if self.totalSeconds else 0.0,
+            "counts": dict(self.counts),
+            "phases": {phase: {"seconds": self.phaseSeconds[phase], "calls": self.phaseCalls[phase]}
+                       for phase in sorted(self.phaseSeconds)},
+            "unattributedSeconds": max(0.0, self.totalSeconds - measured),
+        }
+
+    def to_json(self, path=None):
+        text = json.dumps(self.to_dict(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return text
+
+def _clocked(observer, phase):
+    seconds, calls, clock = observer.phaseSeconds, observer.phaseCalls, time.perf_counter
+    def record(t):
+        seconds[phase] += clock() - t
+        calls[phase] += 1
+    return clock, record
+
+class _TimedSet(set):
+    def __init__(self, observer, phase):
+        super().__init__()
+        self._clock, self._record = _clocked(observer, phase)
+
+    def __contains__(self, item):
+        t = self._clock()
+        found = set.__contains__(self, item)
+        self._record(t)
+        return found
+
+    def add(self, item):
+        t = self._clock()
+        set.add(self, item)
+        self._record(t)
+
+class _TimedDict(dict):
+    def __init__(self, observer, phase):
+        super().__init__()
+        self._clock, self._record = _clocked(observer, phase)
+
+    def __contains__(self, key):
+        t = self._clock()
+        found = dict.__contains__(self, key)
+        self._record(t)
+        return found
+
+    def __getitem__(self, key):
+        t = self._clock()
+        value = dict.__getitem__(self, key)
+        self._record(t)
+        return value
+
+    def __setitem__(self, key, value):
+        t = self._clock()
+        dict.__setitem__(self, key, value)
+        self._record(t)
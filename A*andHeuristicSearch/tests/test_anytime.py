@@ -0,0 +1,36 @@
+import random
+
+from oracle import EightPuzzleOracle
+from puzzle import EightPuzzle, SlidingPuzzle
+from searchCore import AnytimeAStar, SearchLimitReached
+
+def random_instances(count, seed, steps=80):
+    rng = random.Random(seed)
+    walker = SlidingPuzzle((1, 2, 3, 4, 5, 6, 7, 8, 0))
+    instances = []
+    for _ in range(count):
+        state = walker.InitialState()
+        for _ in range(steps):
+            state = walker.Transition(state, rng.choice(walker.Actions(state)))
+        instances.append(state)
+    return instances
+
+def test_bound_holds_when_the_node_limit_stops_the_search():
+    oracle = EightPuzzleOracle()
+    instances = [(0, 1, 3, 4, 8, 7, 6, 5, 2), (4, 1, 5, 7, 0, 6, 3, 8, 2)] + random_instances(20, seed=0)
+    for tiles in instances:
+        optimal = oracle.Distance(tiles)
+        for variant in ("h2", "pdb"):
+            for maxNodes in (20, 50, 200):
+                try:
+                    for result in AnytimeAStar(EightPuzzle(tiles), variant, weight=2, maxNodes=maxNodes):
+                        assert result["cost"] <= result["suboptimalityBound"] * optimal + 1e-9
+                except SearchLimitReached:
+                    pass   # stopped before the first solution
+
+def test_unlimited_search_proves_optimality():
+    oracle = EightPuzzleOracle()
+    for tiles in random_instances(5, seed=1):
+        final = list(AnytimeAStar(EightPuzzle(tiles), "h2", weight=3))[-1]
+        assert final["cost"] == oracle.Distance(tiles)
+        assert final["suboptimalityBound"] == 1.0
@@ -0,0 +1,35 @@
+import io
+import json
+
+from batch import ReadInstances, RunBatch
+
+OPTIONS = {"algo": "astar", "heuristic": "h2", "openList": "heap", "weight": 1,
+           "packed": False, "maxNodes": None, "timeLimit": None}
+
+def run(text, **overrides):
+    out = io.StringIO()
+    written = RunBatch(ReadInstances(io.StringIO(text)), out, dict(OPTIONS, **overrides),
+                       workers=2, chunkSize=2)
+    records = sorted((json.loads(line) for line in out.getvalue().splitlines()),
+                     key=lambda r: r["index"])
+    assert written == len(records)
+    return records
+
+def test_solves_every_instance_and_skips_comments():
+    records = run("# header\n1 2 3 4 5 6 7 8 0\n\n1,2,3,4,5,6,0,7,8\n[1,2,3,4,5,6,7,0,8]\n")
+    assert [r["index"] for r in records] == [0, 1, 2]
+    assert [r["cost"] for r in records] == [0, 2, 1]
+    assert all(r["status"] == "solved" for r in records)
+
+def test_malformed_line_gets_an_error_record():
+    records = run("1 2 3 4 5 6 7 8 0\nabc\n[1, 2,\n1 2 3 4 5 6 0 7 8\n")
+    assert [r["status"] for r in records] == ["solved", "error", "error", "solved"]
+    assert "abc" in records[1]["error"]
+
+def test_worker_exception_is_recorded_per_instance():
+    # No pattern database exists for 5x5 boards
+    board = " ".join(map(str, list(range(1, 24)) + [0, 24]))
+    records = run(f"{board}\n1 2 3 4 5 6 7 8 0\n", heuristic="pdb")
+    assert records[0]["status"] == "error"
+    assert records[0]["error"].startswith("KeyError")
+    assert records[1]["status"] == "solved"
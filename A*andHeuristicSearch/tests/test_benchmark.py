@@ -0,0 +1,28 @@
+import pytest
+
+from benchmark import GenerateInstances, Percentile
+from oracle import EightPuzzleOracle
+
+def test_percentile_is_nearest_rank():
+    assert Percentile(list(range(6)), 50) == 2
+    assert Percentile(list(range(10)), 90) == 8
+    assert Percentile(list(range(100)), 99) == 98
+    assert Percentile([3], 1) == 3
+
+def test_instances_have_the_requested_optimal_depth():
+    oracle = EightPuzzleOracle()
+    buckets = GenerateInstances((4, 10, 18), perDepth=3, seed=0)
+    for depth, bucket in buckets.items():
+        assert len(set(bucket)) == 3
+        assert all(oracle.Distance(tiles) == depth for tiles in bucket)
+
+def test_unreachable_depths_are_rejected():
+    with pytest.raises(ValueError):
+        GenerateInstances((32,), perDepth=1, seed=0)
+    # Only two states are 31 moves from the goal
+    with pytest.raises(ValueError):
+        GenerateInstances((31,), perDepth=3, seed=0)
+
+def test_walk_budget_bounds_the_search():
+    with pytest.raises(ValueError):
+        GenerateInstances((30,), perDepth=50, seed=0, walkLength=10, maxWalks=100)
@@ -0,0 +1,41 @@
+import heapq
+import random
+
+import pytest
+
+from puzzle import EightPuzzle, SlidingPuzzle
+from searchCore import AStar, BucketQueue
+
+@pytest.mark.parametrize("preferHighG", [True, False])
+def test_bucket_queue_pops_lowest_f(preferHighG):
+    rng = random.Random(2)
+    queue, model = BucketQueue(preferHighG), []
+    for node in range(2000):
+        if model and rng.random() < 0.45:
+            f, g, state, popped = queue.Pop()
+            lowest = min(entry[0] for entry in model)
+            assert f == lowest
+            if preferHighG:
+                assert g == max(entry[1] for entry in model if entry[0] == f)
+            model.remove((f, g, state, popped))
+        else:
+            g = rng.randrange(10)
+            entry = (g + rng.randrange(10), g, f"s{node}", node)
+            queue.Push(*entry)
+            model.append(entry)
+        assert len(queue) == len(model)
+    heapq.heapify(model)
+    while model:
+        assert queue.Pop()[0] == heapq.heappop(model)[0]
+
+def test_bucket_and_heap_open_lists_agree():
+    rng = random.Random(3)
+    walker = SlidingPuzzle((1, 2, 3, 4, 5, 6, 7, 8, 0))
+    for _ in range(10):
+        state = walker.InitialState()
+        for _ in range(60):
+            state = walker.Transition(state, rng.choice(walker.Actions(state)))
+        problem = EightPuzzle(state)
+        cost = AStar(problem, "h2", openList="heap")["cost"]
+        assert AStar(problem, "h2", openList="bucket")["cost"] == cost
+        assert AStar(problem, "h2", openList="bucket", preferHighG=False)["cost"] == cost
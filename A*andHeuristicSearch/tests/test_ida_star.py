@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from puzzle import EightPuzzle, SlidingPuzzle
+from searchCore import AStar, IDAStar, SearchLimitReached
+
+def random_instance(width, steps, rng):
+    walker = SlidingPuzzle(tuple(range(1, width * width)) + (0,), width)
+    state = walker.InitialState()
+    for _ in range(steps):
+        state = walker.Transition(state, rng.choice(walker.Actions(state)))
+    return state
+
+def replay(problem, actions):
+    state = problem.InitialState()
+    for action in actions:
+        state = problem.Transition(state, action)
+    return problem.GoalTest(state)
+
+def test_ida_star_is_optimal():
+    rng = random.Random(0)
+    for _ in range(10):
+        tiles = random_instance(3, 60, rng)
+        optimal = AStar(EightPuzzle(tiles), "h2")["cost"]
+        for variant in ("h1", "h2", "pdb"):
+            result = IDAStar(EightPuzzle(tiles), variant)
+            assert result["cost"] == optimal
+            assert replay(EightPuzzle(tiles), result["solution"])
+
+def test_ida_star_matches_a_star_on_fifteen_puzzle():
+    rng = random.Random(1)
+    for _ in range(5):
+        problem = SlidingPuzzle(random_instance(4, 30, rng), 4)
+        result = IDAStar(problem, "h2")
+        assert result["cost"] == AStar(problem, "h2")["cost"]
+        assert replay(problem, result["solution"])
+
+def test_ida_star_respects_node_limit():
+    problem = EightPuzzle((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    with pytest.raises(SearchLimitReached):
+        IDAStar(problem, "h2", maxNodes=100)
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from oracle import EightPuzzleOracle, OracleSolve
+from puzzle import EightPuzzle, SlidingPuzzle
+from searchCore import AStar
+
+def random_instances(count, seed, width=3, steps=60):
+    rng = random.Random(seed)
+    walker = SlidingPuzzle(tuple(range(1, width * width)) + (0,), width)
+    instances = []
+    for _ in range(count):
+        state = walker.InitialState()
+        for _ in range(steps):
+            state = walker.Transition(state, rng.choice(walker.Actions(state)))
+        instances.append(state)
+    return instances
+
+def replay(problem, actions):
+    state = problem.InitialState()
+    for action in actions:
+        assert action in problem.Actions(state)
+        state = problem.Transition(state, action)
+    return problem.GoalTest(state)
+
+def test_depth_counts_cover_the_solvable_half():
+    counts = EightPuzzleOracle().DepthCounts()
+    assert counts[0] == 1
+    assert len(counts) - 1 == 31   # the hardest 8-puzzle instances need 31 moves
+    assert sum(counts) == 181440
+
+def test_oracle_paths_are_optimal():
+    oracle = EightPuzzleOracle()
+    for tiles in random_instances(15, seed=0):
+        problem = EightPuzzle(tiles)
+        result = oracle.Solve(problem)
+        assert result["cost"] == oracle.Distance(tiles) == AStar(problem, "h2")["cost"]
+        assert replay(problem, result["solution"])
+        assert OracleSolve(EightPuzzle(tiles, packed=True))["cost"] == result["cost"]
+
+def test_oracle_rejects_other_goals():
+    oracle = EightPuzzleOracle()
+    assert oracle.Distance((2, 1, 3, 4, 5, 6, 7, 8, 0)) is None   # one swap away: wrong parity
+    with pytest.raises(ValueError):
+        oracle.Solve(SlidingPuzzle(random_instances(1, seed=3, width=4)[0], 4))
@@ -0,0 +1,42 @@
+import random
+
+from patternDB import LoadAdditivePDB
+from puzzle import EightPuzzle, SlidingPuzzle
+from searchCore import AStar
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+
+def random_instances(count, seed, steps=60):
+    rng = random.Random(seed)
+    walker = SlidingPuzzle(GOAL)
+    instances = []
+    for _ in range(count):
+        state = walker.InitialState()
+        for _ in range(steps):
+            state = walker.Transition(state, rng.choice(walker.Actions(state)))
+        instances.append(state)
+    return instances
+
+def test_pdb_is_admissible_and_dominates_manhattan():
+    databases = LoadAdditivePDB(3, GOAL)
+    for tiles in random_instances(30, seed=1):
+        problem = EightPuzzle(tiles)
+        pdb = problem.Heuristic(tiles, "pdb")
+        cells = [0] * 9
+        for i, v in enumerate(tiles):
+            cells[v] = i
+        assert pdb == sum(db.Lookup(cells) for db in databases)
+        assert problem.Heuristic(tiles, "h2") <= pdb <= AStar(problem, "h2")["cost"]
+
+def test_pdb_search_is_optimal():
+    for tiles in random_instances(10, seed=2):
+        problem = EightPuzzle(tiles)
+        assert AStar(problem, "pdb")["cost"] == AStar(problem, "h2")["cost"]
+
+def test_pdb_tables_are_reused_from_the_cache(tmp_path):
+    patterns = ((1, 2, 3), (4, 5, 6, 7, 8))
+    built = LoadAdditivePDB(3, GOAL, patterns, cacheDir=str(tmp_path))
+    assert all(db.built for db in built)
+    reloaded = [type(db)(3, GOAL, db.pattern, str(tmp_path)) for db in built]
+    assert not any(db.built for db in reloaded)
+    assert [db.table[:] for db in reloaded] == [db.table[:] for db in built]
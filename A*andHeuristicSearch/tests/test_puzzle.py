@@ -0,0 +1,32 @@
+import random
+
+from puzzle import SlidingPuzzle
+from searchCore import AStar
+
+def random_walk(puzzle, steps, rng):
+    state = puzzle.InitialState()
+    for _ in range(steps):
+        state = puzzle.Transition(state, rng.choice(puzzle.Actions(state)))
+    return state
+
+def test_heuristic_after_move_matches_full_evaluation():
+    rng = random.Random(0)
+    for width in (3, 4):
+        for packed in (False, True):
+            puzzle = SlidingPuzzle(tuple(range(1, width * width)) + (0,), width, packed)
+            for _ in range(50):
+                state = random_walk(puzzle, 30, rng)
+                blank = puzzle.Blank(state)
+                for variant in ("h0", "h1", "h2"):
+                    h = puzzle.Heuristic(state, variant)
+                    for action in puzzle.Actions(state):
+                        nextState = puzzle.Transition(state, action)
+                        assert (puzzle.HeuristicAfterMove(h, blank, action, nextState, variant)
+                                == puzzle.Heuristic(nextState, variant))
+
+def test_packed_and_tuple_states_find_equal_cost_solutions():
+    rng = random.Random(1)
+    for _ in range(10):
+        initial = random_walk(SlidingPuzzle(tuple(range(1, 9)) + (0,)), 40, rng)
+        costs = {AStar(SlidingPuzzle(initial, packed=packed), "h2")["cost"] for packed in (False, True)}
+        assert len(costs) == 1
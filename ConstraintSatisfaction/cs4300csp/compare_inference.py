@@ -0,0 +1,41 @@
+import sys
+import time
+from typing import List
+
+from cs4300_csp_parser import parse_cs4300
+from cs4300_csp import CSPSolver, presolve
+
+HEURISTICS = ["None", "MRV", "LCV", "DOMWDEG"]
+MODES = ["FC", "AC", "MAC"]
+
+def compare(paths: List[str], repeat: int = 5, backjump: bool = False, reduce: bool = False):
+    """Print backtracks and median runtime for every heuristic x inference mode on each file,
+    with and without conflict-directed backjumping when backjump is set. With reduce, each
+    problem is presolved first (untimed)."""
+    print(f"{'instance':<34} {'heuristic':<9} {'mode':<4} {'cbj':<4} {'backtracks':>10} {'ms':>9}")
+    for path in paths:
+        csp = parse_cs4300(path)
+        if reduce:
+            csp = presolve(csp).csp
+        name = path.replace("\\", "/").rsplit("/", 1)[-1]
+        for heuristic in HEURISTICS:
+            for mode in MODES:
+                for jump in ((False, True) if backjump else (False,)):
+                    times = []
+                    for _ in range(repeat):
+                        solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+                        start = time.perf_counter()
+                        found, _ = solver.solve_backtracking(heuristic, inference=mode, backjump=jump)
+                        times.append(time.perf_counter() - start)
+                    ms = sorted(times)[len(times) // 2] * 1000
+                    status = "" if found else "  (no solution)"
+                    cbj = "yes" if jump else "no"
+                    print(f"{name:<34} {heuristic:<9} {mode:<4} {cbj:<4} {solver.backtracks:>10} {ms:>9.2f}{status}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    paths = [a for a in args if a not in ("--backjump", "--presolve")]
+    if not paths:
+        print("Usage: python compare_inference.py [--backjump] [--presolve] <problem.csp> [more.csp ...]")
+        sys.exit(1)
+    compare(paths, backjump="--backjump" in args, reduce="--presolve" in args)
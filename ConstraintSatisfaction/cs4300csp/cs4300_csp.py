@@ -1,7 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Callable, Iterable, Optional
+from typing import Dict, List, Tuple, Callable, Iterable, Iterator, Optional
+import multiprocessing
+import multiprocessing.connection
 import operator
+import random
+import time
 
 Val = int
 Assignment = Dict[str, Val]
@@ -16,40 +20,227 @@ class Constraint:
     scope: Tuple[str, ...]
     pred: Callable[[Assignment], bool]
     pretty: str
+    propagator: Optional["Propagator"] = None
 
     def get_description(self):
         return self.pretty
 
+# ---------- Propagators ----------
+# A propagator narrows the domains of a constraint's unassigned variables right after one
+# of its variables is assigned, using the solver's domain API (domain_values, keep, remove).
+# propagate() returns False when some domain is wiped out. It must never remove a value
+# that could still satisfy the constraint; pred remains the final consistency check.
+class Propagator:
+    # True when propagate() reasons over current domains alone, so arc consistency can
+    # also call it with var=None, before anything is assigned
+    domain_based = False
+    # True when propagate() already leaves the constraint generalized arc consistent
+    enforces_gac = False
+
+    def reset(self, solver: "CSPSolver"):
+        """Called at the start of every solve; propagators with search state initialise it
+        here as solver.prop_state[self]. It never lives on the propagator itself, which
+        every solver over the same constraints shares, and changes to it are recorded with
+        solver.save(solver.prop_state, (self, old)) so backtracking restores them."""
+
+    def propagate(self, solver: "CSPSolver", var: Optional[str]) -> bool:
+        return True
+
+class AllDiffPropagator(Propagator):
+    def __init__(self, vars: List[str]):
+        self.vars = tuple(dict.fromkeys(vars))
+
+    def propagate(self, solver, var):
+        val = solver.assignment[var]
+        for w in self.vars:
+            if w != var and w not in solver.assignment and not solver.remove(w, val):
+                return False
+        return True
+
+class BinaryPropagator(Propagator):
+    """op(x, y): once one side is assigned, keep only the other side's supported values."""
+    def __init__(self, op: Callable[[int, int], bool], x: str, y: str):
+        self.op, self.x, self.y = op, x, y
+
+    def propagate(self, solver, var):
+        op, x, y, a = self.op, self.x, self.y, solver.assignment
+        if var == x and y not in a:
+            vx = a[x]
+            return solver.keep(y, lambda vy: op(vx, vy))
+        if var == y and x not in a:
+            vy = a[y]
+            return solver.keep(x, lambda vx: op(vx, vy))
+        return True
+
+class EqPropagator(BinaryPropagator):
+    """x == y: intersect domains instead of testing every value."""
+    def __init__(self, x: str, y: str):
+        super().__init__(operator.eq, x, y)
+
+    def propagate(self, solver, var):
+        a = solver.assignment
+        other = self.y if var == self.x else self.x
+        if other in a:
+            return True
+        return solver.restrict(other, (a[var],))
+
+class LinearPropagator(Propagator):
+    """sum(coef * var) op k, by bounds reasoning over the unassigned terms."""
+    domain_based = True
+
+    def __init__(self, vars: List[str], coefs: List[int], opstr: str, k: int):
+        self.terms = list(zip(vars, coefs))
+        self.opstr, self.k = opstr, k
+
+    def propagate(self, solver, var):
+        a = solver.assignment
+        fixed = 0
+        free = []  # (var, coef, lowest and highest coef * value over its domain)
+        for w, c in self.terms:
+            if w in a:
+                fixed += c * a[w]
+            else:
+                vals = solver.domain_values(w)
+                if not vals:
+                    return False
+                lo, hi = c * min(vals), c * max(vals)
+                free.append((w, c, min(lo, hi), max(lo, hi)))
+        lo_all = fixed + sum(t[2] for t in free)
+        hi_all = fixed + sum(t[3] for t in free)
+        op, k = self.opstr, self.k
+        for w, c, lo, hi in free:
+            # Range the term c * w may take while the others can still make up the rest
+            rest_lo, rest_hi = lo_all - lo, hi_all - hi
+            low, high = None, None
+            if op in ("==", "<=", "<"):
+                high = k - rest_lo - (1 if op == "<" else 0)
+            if op in ("==", ">=", ">"):
+                low = k - rest_hi + (1 if op == ">" else 0)
+            if op == "!=":
+                if len(free) == 1:
+                    if not solver.keep(w, lambda v: c * v != k - fixed):
+                        return False
+                continue
+            if not solver.keep(w, lambda v: (low is None or c * v >= low) and (high is None or c * v <= high)):
+                return False
+        return True
+
+class TablePropagator(Propagator):
+    """Compact-Table GAC. Tuples are bits of big ints: `live` holds the tuples whose values
+    are all still in their domains, and supports[i][val] the tuples with val in column i,
+    so each update and support test is one word-parallel AND. `seen` is each column's
+    domain at the last call, so only the values removed since then are processed. Both are
+    kept in solver.prop_state[self] and restored through the solver trail on backtrack."""
+    domain_based = True
+    enforces_gac = True
+
+    def __init__(self, vars: List[str], allowed: Iterable[Tuple[int, ...]]):
+        self.vars = tuple(vars)
+        self.tuples = [tuple(t) for t in allowed]
+        self.supports: List[Dict[Val, int]] = [{} for _ in self.vars]
+        for k, t in enumerate(self.tuples):
+            bit = 1 << k
+            for i, val in enumerate(t):
+                col = self.supports[i]
+                col[val] = col.get(val, 0) | bit
+
+    def reset(self, solver):
+        # -1: column not seen yet
+        solver.prop_state[self] = ((1 << len(self.tuples)) - 1, [-1] * len(self.vars))
+
+    def propagate(self, solver, var):
+        a, masks, values, bit_of = solver.assignment, solver.masks, solver.values, solver.bit_of
+        state = solver.prop_state[self]
+        live, seen = state[0], list(state[1])
+        # Update: drop the tuples that use a value gone from its column since the last call
+        for i, w in enumerate(self.vars):
+            mask = bit_of[w][a[w]] if w in a else masks[w]
+            old = seen[i]
+            if mask == old:
+                continue
+            col, vals = self.supports[i], values[w]
+            gone = old & ~mask if old != -1 and not mask & ~old else -1
+            if gone != -1 and gone.bit_count() < mask.bit_count():
+                while gone:
+                    low = gone & -gone
+                    gone ^= low
+                    live &= ~col.get(vals[low.bit_length() - 1], 0)
+            else:
+                kept = 0
+                while mask:
+                    low = mask & -mask
+                    mask ^= low
+                    kept |= col.get(vals[low.bit_length() - 1], 0)
+                live &= kept
+            seen[i] = bit_of[w][a[w]] if w in a else masks[w]
+        ok = live != 0
+        # Filter: a value whose support set misses every live tuple leaves the domain
+        for i, w in enumerate(self.vars) if ok else ():
+            if w in a:
+                continue
+            col = self.supports[i]
+            if not solver.keep(w, lambda v: col.get(v, 0) & live):
+                ok = False
+                break
+            seen[i] = masks[w]
+        if live != state[0] or seen != state[1]:
+            solver.save(solver.prop_state, (self, state))
+            solver.prop_state[self] = (live, seen)
+        return ok
+
 # ---------- Constraint builders ----------
 def c_alldiff(vars: List[str]) -> Constraint:
     def pred(a: Assignment) -> bool:
         vals = [a[v] for v in vars if v in a]
         return len(vals) == len(set(vals))
-    return Constraint(tuple(vars), pred, f"alldiff({','.join(vars)})")
+    return Constraint(tuple(vars), pred, f"alldiff({','.join(vars)})", AllDiffPropagator(vars))
 
 def c_bin(op: Callable[[int,int], bool], x: str, y: str, opname: str) -> Constraint:
     def pred(a: Assignment) -> bool:
         if x in a and y in a:
             return op(a[x], a[y])
         return True
-    return Constraint((x,y), pred, f"{opname}({x},{y})")
+    propagator = EqPropagator(x, y) if opname == "eq" else BinaryPropagator(op, x, y)
+    return Constraint((x,y), pred, f"{opname}({x},{y})", propagator)
 
 def c_in(x: str, allowed: List[int]) -> Constraint:
     def pred(a: Assignment) -> bool:
         return (x not in a) or (a[x] in allowed)
-    return Constraint((x,), pred, f"in({x},{allowed})")
+    # Unary: applied once by node consistency, nothing left to propagate
+    return Constraint((x,), pred, f"in({x},{allowed})", Propagator())
+
+def c_cmp(op: Callable[[int,int], bool], x: str, k: int, opname: str) -> Constraint:
+    """op(x, k) against the constant k; unary, so node consistency applies it once."""
+    def pred(a: Assignment) -> bool:
+        return (x not in a) or op(a[x], k)
+    return Constraint((x,), pred, f"{opname}({x},{k})", Propagator())
+
+SUM_OPS = {"==": operator.eq, "!=": operator.ne, "<=": operator.le,
+           "<": operator.lt, ">=": operator.ge, ">": operator.gt}
 
 def c_sum(vars: List[str], opstr: str, k: int) -> Constraint:
-    opmap = {"==": operator.eq, "!=": operator.ne, "<=": operator.le,
-             "<": operator.lt, ">=": operator.ge, ">": operator.gt}
-    if opstr not in opmap: raise ValueError(f"bad sum op {opstr}")
-    opf = opmap[opstr]
+    if opstr not in SUM_OPS: raise ValueError(f"bad sum op {opstr}")
+    opf = SUM_OPS[opstr]
     def pred(a: Assignment) -> bool:
         # Accept partial assignments; only check when fully assigned
         if not all(v in a for v in vars):
             return True
         return opf(sum(a[v] for v in vars), k)
-    return Constraint(tuple(vars), pred, f"sum({vars}) {opstr} {k}")
+    return Constraint(tuple(vars), pred, f"sum({vars}) {opstr} {k}",
+                      LinearPropagator(vars, [1] * len(vars), opstr, k))
+
+def c_linear(vars: List[str], coefs: List[int], opstr: str, k: int) -> Constraint:
+    """sum(coef * var) op k; a variable may appear more than once."""
+    if opstr not in SUM_OPS: raise ValueError(f"bad sum op {opstr}")
+    opf = SUM_OPS[opstr]
+    terms = list(zip(vars, coefs))
+    def pred(a: Assignment) -> bool:
+        if not all(v in a for v in vars):
+            return True
+        return opf(sum(c * a[v] for v, c in terms), k)
+    pretty = " + ".join(f"{c}*{v}" for v, c in terms)
+    return Constraint(tuple(dict.fromkeys(vars)), pred, f"linear({pretty}) {opstr} {k}",
+                      LinearPropagator(vars, coefs, opstr, k))
 
 def c_table(vars: List[str], allowed: List[Tuple[int, ...]]) -> Constraint:
     allowed_set = set(tuple(t) for t in allowed)
@@ -58,7 +249,8 @@ def c_table(vars: List[str], allowed: List[Tuple[int, ...]]) -> Constraint:
             tup = tuple(a[v] for v in vars)
             return tup in allowed_set
         return True
-    return Constraint(tuple(vars), pred, f"table({vars}) allowed {allowed}")
+    return Constraint(tuple(vars), pred, f"table({vars}) allowed {allowed}",
+                      TablePropagator(vars, allowed_set))
 
 def c_add10(x: str, y: str, cin: str, z: str, cout: str) -> Constraint:
     """Digit-wise base-10 addition: x + y + cin = 10*cout + z, where cin, cout in {0,1} and x,y,z in 0..9.
@@ -69,9 +261,145 @@ def c_add10(x: str, y: str, cin: str, z: str, cout: str) -> Constraint:
         if all(v in a for v in scope):
             return (a[x] + a[y] + a[cin]) == 10 * a[cout] + a[z]
         return True
-    return Constraint(scope, pred, f"add10({x},{y},{cin}->{z},{cout})")
+    # Column arithmetic as the linear equation x + y + cin - z - 10*cout == 0
+    return Constraint(scope, pred, f"add10({x},{y},{cin}->{z},{cout})",
+                      LinearPropagator(list(scope), [1, 1, 1, -1, -10], "==", 0))
+
+# ---------- Presolve ----------
+class Presolved:
+    """presolve()'s reduced problem; rep maps each original variable to the variable that
+    stands for it in csp."""
+    def __init__(self, csp: CSP, rep: Dict[str, str]):
+        self.csp = csp
+        self.rep = rep
+
+    def expand(self, solution: Assignment) -> Assignment:
+        """A solution of the reduced problem as a solution of the original one."""
+        return {v: solution[r] for v, r in self.rep.items()}
+
+def presolve(csp: CSP) -> Presolved:
+    """Merge the variables tied together by eq() into one representative each, the first
+    declared, whose domain is the intersection of theirs. Every constraint left over one
+    variable (in(), eq against a constant, a merged eq, ...) is folded into its domain, and
+    one whose variables are all fixed is checked once; neither reaches the search. The
+    others are rebuilt over the representatives. Undeclared names are never assigned, so
+    they are not merged and constraints over them keep their meaning. The reduced problem
+    has exactly the original's solutions once expanded; an empty domain means it has none."""
+    order = {v: i for i, v in enumerate(csp.domains)}
+    parent = {v: v for v in csp.domains}
+
+    def find(v: str) -> str:
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for c in csp.constraints:
+        p = c.propagator
+        if isinstance(p, EqPropagator) and p.x in parent and p.y in parent:
+            rx, ry = find(p.x), find(p.y)
+            if rx != ry:
+                # The earlier declared root stays, so every class is named by its first variable
+                if order[ry] < order[rx]:
+                    rx, ry = ry, rx
+                parent[ry] = rx
+    rep = {v: find(v) for v in csp.domains}
+    domains = {v: list(vals) for v, vals in csp.domains.items() if rep[v] == v}
+    for v, r in rep.items():
+        if r != v:
+            allowed = set(csp.domains[v])
+            domains[r] = [val for val in domains[r] if val in allowed]
+
+    pending = []
+    for c in csp.constraints:
+        names = [u for u in dict.fromkeys(c.scope) if u in rep]
+        reps = set(rep[u] for u in names)
+        if len(reps) > 1:
+            pending.append(c)
+        elif reps:
+            r = reps.pop()
+            domains[r] = [val for val in domains[r] if c.pred(dict.fromkeys(names, val))]
+
+    constraints, seen = [], set()
+    for c in pending:
+        names = [u for u in dict.fromkeys(c.scope) if u in rep]
+        if all(len(domains[rep[u]]) == 1 for u in names):
+            if not c.pred({u: domains[rep[u]][0] for u in names}):
+                domains[rep[names[0]]] = []
+            continue
+        rebuilt = _rebuild(c, rep)
+        if rebuilt is None:
+            continue
+        if isinstance(rebuilt.propagator, AllDiffPropagator):
+            declared = [u for u in rebuilt.scope if u in domains]
+            if len(declared) != len(set(declared)):
+                # Two of its variables were merged: alldiff can never hold
+                domains[declared[0]] = []
+                continue
+        if isinstance(rebuilt.propagator, (AllDiffPropagator, LinearPropagator, TablePropagator)):
+            # Their descriptions say everything; merging often makes duplicates of them
+            if rebuilt.pretty in seen:
+                continue
+            seen.add(rebuilt.pretty)
+        constraints.append(rebuilt)
+    return Presolved(CSP(domains, constraints), rep)
+
+def _rebuild(c: Constraint, rep: Dict[str, str]) -> Optional[Constraint]:
+    """c over the representatives in rep, or None if it always holds."""
+    p = c.propagator
+    name = lambda u: rep.get(u, u)
+    if isinstance(p, AllDiffPropagator):
+        return c_alldiff([name(u) for u in c.scope])
+    # The remaining builders' constraints only test full assignments of their scope, which
+    # an undeclared name never gets
+    if isinstance(p, (BinaryPropagator, LinearPropagator, TablePropagator)) and \
+            any(u not in rep for u in c.scope):
+        return None
+    if isinstance(p, BinaryPropagator):
+        return c_bin(p.op, rep[p.x], rep[p.y], c.pretty.split("(", 1)[0])
+    if isinstance(p, LinearPropagator):
+        coefs: Dict[str, int] = {}
+        for w, k in p.terms:
+            coefs[rep[w]] = coefs.get(rep[w], 0) + k
+        return c_linear(list(coefs), list(coefs.values()), p.opstr, p.k)
+    if isinstance(p, TablePropagator):
+        names = [rep[u] for u in p.vars]
+        cols = list(dict.fromkeys(names))
+        first = [names.index(w) for w in cols]
+        # A merged column keeps only the rows agreeing on it
+        rows = {tuple(t[i] for i in first) for t in p.tuples
+                if all(t[i] == t[names.index(w)] for i, w in enumerate(names))}
+        return c_table(cols, sorted(rows))
+    # Anything else keeps its own test, reading the merged variables under their old names
+    names = tuple(dict.fromkeys(c.scope))
+    pred = c.pred
+    def renamed(a: Assignment) -> bool:
+        return pred({u: a[name(u)] for u in names if name(u) in a})
+    return Constraint(tuple(dict.fromkeys(name(u) for u in names)), renamed, c.pretty)
 
 # ---------- CSPSolver with Heuristics ----------
+class _Restart(Exception):
+    """Raised inside the search when the backtrack cutoff of the current run is reached."""
+
+def luby(i: int) -> int:
+    """The i-th term (from 1) of the Luby sequence 1,1,2,1,1,2,4,1,1,2,1,1,2,4,8,..."""
+    size, term = 1, 1
+    # The first 2^k - 1 terms end in 2^(k-1); the ones before that repeat the first half twice
+    while size < i:
+        size, term = 2 * size + 1, 2 * term
+    while size != i:
+        size, term = size // 2, term // 2
+        if i > size:
+            i -= size
+    return term
+
+class _TrailedDict(dict):
+    """A dict whose changes are recorded on the solver trail as (dict, (key, old value));
+    undoing one puts the old value back."""
+    def restore(self, state):
+        key, old = state
+        self[key] = old
+
 class CSPSolver:
     def __init__(self, vars: List[str], domains: Dict[str, List[Val]], constraints: List[Constraint]):
         self.vars = vars
@@ -82,99 +410,868 @@ class CSPSolver:
             for v in c.scope:
                 if v in self.cons_by_var:
                     self.cons_by_var[v].append(c)
+        # Constraints with a propagator narrow domains themselves when one of their
+        # variables is assigned. Scope names with no declared domain are never assigned,
+        # so constraints over them always hold; they keep using pred and those names are
+        # left out of forward checking.
+        self.props_by_var: Dict[str, List[Constraint]] = {v: [] for v in vars}
+        # shared[v][w]: the remaining constraints over both v and w. Assigning v can only
+        # change the truth of these for w's values, so forward checking tests nothing else.
+        self.shared: Dict[str, Dict[str, List[Constraint]]] = {v: {} for v in vars}
+        for c in constraints:
+            scope = list(dict.fromkeys(c.scope))
+            if c.propagator is not None and all(v in self.props_by_var for v in scope):
+                for v in scope:
+                    self.props_by_var[v].append(c)
+                continue
+            for v in scope:
+                if v not in self.shared:
+                    continue
+                for w in scope:
+                    if w != v and w in self.shared:
+                        self.shared[v].setdefault(w, []).append(c)
+        # Constraints whose only declared variable is v (in(), eq against an undeclared name, ...)
+        self.unary: Dict[str, List[Constraint]] = {
+            v: [c for c in self.cons_by_var[v] if all(w == v or w not in self.cons_by_var for w in c.scope)]
+            for v in vars
+        }
+        # Conflict sets, explanations and nogoods are bitmasks over the variables
+        self.var_bit: Dict[str, int] = {v: 1 << i for i, v in enumerate(vars)}
+        # wdeg_cons[v]: v's constraints with another declared variable, as (id, those
+        # variables); built by the first DOMWDEG solve
+        self.wdeg_cons: Optional[Dict[str, List[Tuple[int, Tuple[str, ...]]]]] = None
+        self._build_arc_consistency()
+        # LCV's conflict tables, built by the first LCV solve
+        self.lcv_pairs: Optional[Dict[str, list]] = None
+        # Bitset domains: bit i of masks[v] stands for values[v][i]
+        self.values: Dict[str, List[Val]] = {v: list(domains[v]) for v in vars}
+        self.bit_of: Dict[str, Dict[Val, int]] = {
+            v: {val: 1 << i for i, val in enumerate(vals)} for v, vals in self.values.items()
+        }
+        self.masks: Dict[str, int] = {}
+        # Undo trail of (var, mask before pruning) and (propagator, saved state) entries;
+        # a decision level is a trail length
+        self.trail: List[Tuple[object, object]] = []
         self.assignment: Assignment = {}
+        # False while counting: solutions are yielded as None instead of copied
+        self.collect = True
         self.backtracks = 0
+        # dom/wdeg failure counts by constraint id
+        self.weights: Dict[int, int] = {}
+        # Propagators' search state (see Propagator.reset), by propagator
+        self.prop_state: _TrailedDict = _TrailedDict()
+        # Backjumping state: explanations (None when off; expl[v] is the bitmask of the
+        # decision variables whose assignments pruned v's domain), the reason for the prunes
+        # being made and the conflict set of the last failure
+        self.backjump = False
+        self.expl: Optional[_TrailedDict] = None
+        self.cause = 0
+        self.conflict = 0
+        # Learned nogoods (tuples of (var, value) literals, oldest assignment first), least
+        # recently used first, each with its two watched literals; and the nogoods watching
+        # each literal
+        self.nogoods: Dict[Tuple[Tuple[str, Val], ...], List[Tuple[str, Val]]] = {}
+        self.watches: Dict[Tuple[str, Val], Dict[Tuple[Tuple[str, Val], ...], None]] = {}
+        self.max_nogoods = 0
+        # Randomized tie-breaking (None keeps the deterministic orderings), the variable
+        # order of the default heuristic, the backtrack count ending the current run, and
+        # the number of restarts made
+        self.rng: Optional[random.Random] = None
+        self.order: List[str] = vars
+        self.cutoff = float('inf')
+        self.restarts = 0
 
-    def solve_backtracking(self, heuristic: str = 'None') -> Tuple[bool, Optional[Assignment]]:
+    def solve_backtracking(self, heuristic: str = 'None', inference: str = 'FC',
+                           backjump: bool = False, max_nogoods: int = 1000,
+                           seed: Optional[int] = None, restarts: Optional[str] = None,
+                           restart_base: int = 100) -> Tuple[bool, Optional[Assignment]]:
+        """inference: 'FC' forward checks after each assignment, 'AC' first makes the
+        problem arc consistent and then forward checks, 'MAC' maintains arc consistency
+        after every assignment.
+        backjump: conflict-directed backjumping; a failed subtree jumps straight back to the
+        latest variable involved in its conflict set, and that set is learned as a nogood
+        (at most max_nogoods are kept, least recently used evicted first).
+        seed: break ties in variable and value selection at random (the default heuristic
+        shuffles the variable order, values without a heuristic are shuffled).
+        restarts: 'luby' or 'geometric' abandons a run after restart_base * luby(i) or
+        restart_base * 1.5**i backtracks and starts over, keeping learned nogoods and
+        dom/wdeg weights. Restarts randomize with seed 0 unless another seed is given."""
+        if restarts not in (None, 'luby', 'geometric'):
+            raise ValueError(f"bad restart schedule {restarts}")
+        if restarts is not None and seed is None:
+            seed = 0
+        if not self._start(heuristic, inference, backjump, max_nogoods, seed):
+            return False, None
+        root = len(self.trail)
+        while True:
+            if self.rng is not None and heuristic not in ('MRV', 'DOMWDEG'):
+                self.order = self.rng.sample(self.vars, len(self.vars))
+            if restarts == 'luby':
+                self.cutoff = self.backtracks + restart_base * luby(self.restarts + 1)
+            elif restarts == 'geometric':
+                self.cutoff = self.backtracks + int(restart_base * 1.5 ** self.restarts)
+            try:
+                solution = next(self._backtrack(), None)
+                return solution is not None, solution
+            except _Restart:
+                self._undo(root)
+                self.assignment.clear()
+                if heuristic == 'LCV':
+                    self.lcv_cache.clear()
+                self.restarts += 1
+
+    def solutions(self, heuristic: str = 'None', inference: str = 'FC', backjump: bool = False,
+                  max_nogoods: int = 1000, seed: Optional[int] = None) -> Iterator[Assignment]:
+        """Yield every solution, one at a time, as the search reaches it; the options are
+        solve_backtracking's. Restarts would find the same solutions again, so there are none.
+        All search state lives on the solver, so generators of different solvers over the
+        same constraints can be suspended and resumed in any interleaving."""
+        if not self._start(heuristic, inference, backjump, max_nogoods, seed):
+            return
+        if self.rng is not None and heuristic not in ('MRV', 'DOMWDEG'):
+            self.order = self.rng.sample(self.vars, len(self.vars))
+        yield from self._backtrack()
+
+    def count_solutions(self, heuristic: str = 'None', inference: str = 'FC', backjump: bool = False,
+                        max_nogoods: int = 1000) -> int:
+        """The number of solutions, found like solutions() without building a dict for each."""
+        if not self._start(heuristic, inference, backjump, max_nogoods, None):
+            return 0
+        self.collect = False
+        try:
+            return sum(1 for _ in self._backtrack())
+        finally:
+            self.collect = True
+
+    def _start(self, heuristic: str, inference: str, backjump: bool, max_nogoods: int,
+               seed: Optional[int]) -> bool:
+        """Reset the search state for a new solve and make the root node consistent (arc
+        consistent too unless inference is 'FC'). False if that already empties a domain."""
+        if inference not in ('FC', 'AC', 'MAC'):
+            raise ValueError(f"bad inference mode {inference}")
+        self.assignment.clear()
         self.backtracks = 0
         self.heuristic = heuristic
-        self.domains = {v: list(ds) for v, ds in self.domains.items()} # Use a fresh copy
-        solution = next(self._backtrack(), None)
-        return solution is not None, solution
+        self.inference = inference
+        self.masks = {v: (1 << len(vals)) - 1 for v, vals in self.values.items()}
+        self.trail = []
+        self.weights = {id(c): 1 for c in self.constraints}
+        self.backjump = backjump
+        self.expl = _TrailedDict(dict.fromkeys(self.vars, 0)) if backjump else None
+        self.cause = self.conflict = 0
+        self.nogoods, self.watches = {}, {}
+        self.max_nogoods = max_nogoods if backjump else 0
+        self.rng = random.Random(seed) if seed is not None else None
+        self.order = self.vars
+        self.cutoff = float('inf')
+        self.restarts = 0
+        if heuristic == 'LCV':
+            if self.lcv_pairs is None:
+                self._build_lcv()
+            # Cached orders broke their ties with the previous run's rng
+            self.lcv_cache.clear()
+        if heuristic == 'DOMWDEG' and self.wdeg_cons is None:
+            self.wdeg_cons = {}
+            for v in self.vars:
+                others = {}
+                for c in self.cons_by_var[v]:
+                    scope = tuple(w for w in dict.fromkeys(c.scope) if w != v and w in self.cons_by_var)
+                    if scope:
+                        others[id(c)] = scope
+                self.wdeg_cons[v] = list(others.items())
+        self.prop_state = _TrailedDict()
+        for c in self.constraints:
+            if c.propagator is not None:
+                c.propagator.reset(self)
+        if not self._node_consistency():
+            return False
+        return inference == 'FC' or self._arc_consistency(range(len(self.ac_cons)))
+
+    def domain_values(self, v: str) -> List[Val]:
+        """Values left in v's domain, in the original domain order."""
+        vals, mask, out = self.values[v], self.masks[v], []
+        while mask:
+            low = mask & -mask
+            out.append(vals[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+    def keep(self, v: str, test: Callable[[Val], bool]) -> bool:
+        """Remove v's values failing test; False if the domain is wiped out."""
+        vals, mask, removed = self.values[v], self.masks[v], 0
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            if not test(vals[low.bit_length() - 1]):
+                removed |= low
+        if removed:
+            self._prune(v, removed)
+        return self.masks[v] != 0
+
+    def restrict(self, v: str, allowed: Iterable[Val]) -> bool:
+        """Intersect v's domain with allowed; False if the domain is wiped out."""
+        bit_of, keep = self.bit_of[v], 0
+        for val in allowed:
+            keep |= bit_of.get(val, 0)
+        removed = self.masks[v] & ~keep
+        if removed:
+            self._prune(v, removed)
+        return self.masks[v] != 0
+
+    def remove(self, v: str, val: Val) -> bool:
+        """Remove one value from v's domain; False if the domain is wiped out."""
+        bit = self.bit_of[v].get(val, 0)
+        if self.masks[v] & bit:
+            self._prune(v, bit)
+        return self.masks[v] != 0
+
+    def save(self, obj: _TrailedDict, state):
+        """Record a change to obj so undoing past this point calls obj.restore(state)."""
+        self.trail.append((obj, state))
+
+    def _prune(self, v: str, removed: int):
+        self.trail.append((v, self.masks[v]))
+        self.masks[v] &= ~removed
+        if self.expl is not None:
+            old = self.expl[v]
+            if old | self.cause != old:
+                self.save(self.expl, (v, old))
+                self.expl[v] = old | self.cause
+
+    def _undo(self, level: int):
+        """Restore every domain pruned since the trail had `level` entries."""
+        trail, masks = self.trail, self.masks
+        while len(trail) > level:
+            v, old = trail.pop()
+            if v.__class__ is str:
+                masks[v] = old
+            else:
+                v.restore(old)
+
+    def _node_consistency(self) -> bool:
+        """Drop values failing constraints whose only declared variable is v (in(), etc.).
+        False if some domain is empty, whether already or now."""
+        for v in self.vars:
+            unary = self.unary[v]
+            vals, mask, removed = self.values[v], self.masks[v], 0
+            while mask and unary:
+                low = mask & -mask
+                mask ^= low
+                a = {v: vals[low.bit_length() - 1]}
+                if not all(c.pred(a) for c in unary):
+                    removed |= low
+            if removed:
+                self._prune(v, removed)
+            if not self.masks[v]:
+                return False
+        return True
+
+    def _build_lcv(self):
+        """lcv_pairs[v]: a [neighbor, constraint, weight, context vars, alldiff, context,
+        conflict rows] entry per constraint of v and declared neighbor in its scope. weight
+        counts repeated scope entries, so scores match trying every (constraint, neighbor)
+        occurrence."""
+        self.lcv_pairs = {v: [] for v in self.vars}
+        self.lcv_cache: Dict[str, Tuple[tuple, List[Val]]] = {}
+        for c in self.constraints:
+            scope = [v for v in dict.fromkeys(c.scope) if v in self.lcv_pairs]
+            if len(scope) < 2:
+                continue
+            # A plain alldiff rules out a neighbor value by equality, no pred calls needed
+            alldiff = isinstance(c.propagator, AllDiffPropagator) and len(c.scope) == len(set(c.scope))
+            for v in scope:
+                for n in scope:
+                    if n != v:
+                        others = tuple([w for w in scope if w != v and w != n])
+                        weight = c.scope.count(v) * c.scope.count(n)
+                        self.lcv_pairs[v].append([n, c, weight, others, alldiff, None, {}])
+        self.lcv_watch: Dict[str, Tuple[str, ...]] = {
+            v: tuple(dict.fromkeys(entry[0] for entry in pairs)) for v, pairs in self.lcv_pairs.items()
+        }
+
+    # ---------- Arc consistency ----------
+    def _build_arc_consistency(self):
+        """Classify every constraint over two or more declared variables by how it is revised:
+        'alldiff' (a fixed value leaves its peers), 'binary' (support search with residues),
+        'propagator' (a domain-based propagator, Compact-Table for tables of any arity) or
+        'pred' (trial assignment through pred)."""
+        self.ac_cons: List[Tuple[Constraint, str, Tuple[str, ...]]] = []
+        self.ac_by_var: Dict[str, List[int]] = {v: [] for v in self.vars}
+        # residues[i][x][a]: the last value of the other variable found to support x = a
+        self.residues: List[Dict[str, Dict[Val, Val]]] = []
+        for c in self.constraints:
+            scope = tuple(v for v in dict.fromkeys(c.scope) if v in self.ac_by_var)
+            if len(scope) < 2:
+                continue
+            whole = len(scope) == len(set(c.scope))
+            if isinstance(c.propagator, AllDiffPropagator):
+                kind = 'alldiff'
+            elif c.propagator is not None and c.propagator.enforces_gac and whole:
+                kind = 'propagator'
+            elif len(scope) == 2:
+                kind = 'binary'
+            elif c.propagator is not None and c.propagator.domain_based and whole:
+                kind = 'propagator'
+            else:
+                kind = 'pred'
+            for v in scope:
+                self.ac_by_var[v].append(len(self.ac_cons))
+            self.ac_cons.append((c, kind, scope))
+            self.residues.append({v: {} for v in scope})
+
+    def _arc_consistency(self, queue: Iterable[int]) -> bool:
+        """AC-3 over constraints: revise each queued constraint and requeue the constraints
+        on every variable it narrowed, until nothing changes. False on a domain wipeout."""
+        queue = list(queue)
+        pending = set(queue)
+        masks = self.masks
+        while queue:
+            i = queue.pop()
+            pending.discard(i)
+            c, kind, scope = self.ac_cons[i]
+            before = [masks[v] for v in scope]
+            if self.expl is not None:
+                self.cause = self._explain(scope)
+            if not self._revise(i, c, kind, scope):
+                self._fail(c, self.cause)
+                return False
+            for v, mask in zip(scope, before):
+                if masks[v] != mask:
+                    for j in self.ac_by_var[v]:
+                        if j not in pending:
+                            pending.add(j)
+                            queue.append(j)
+        return True
+
+    def _revise(self, i: int, c: Constraint, kind: str, scope: Tuple[str, ...]) -> bool:
+        masks = self.masks
+        if kind == 'alldiff':
+            # Pairwise != is arc consistent once no fixed value appears in a peer's domain
+            changed = True
+            while changed:
+                changed = False
+                for w in scope:
+                    m = masks[w]
+                    if m & (m - 1):
+                        continue
+                    val = self.values[w][m.bit_length() - 1]
+                    for u in scope:
+                        bit = self.bit_of[u].get(val, 0)
+                        if u != w and masks[u] & bit:
+                            self._prune(u, bit)
+                            if not masks[u]:
+                                return False
+                            changed = True
+            return True
+        if kind == 'binary':
+            x, y = scope
+            return self._revise_arc(i, c, x, y) and self._revise_arc(i, c, y, x)
+        if kind == 'propagator':
+            return c.propagator.propagate(self, None)
+        # 'pred': forward check each unassigned variable against the current assignment
+        a = self.assignment
+        for w in scope:
+            if w in a:
+                continue
+            def supported(val, w=w):
+                a[w] = val
+                try:
+                    return c.pred(a)
+                finally:
+                    del a[w]
+            if not self.keep(w, supported):
+                return False
+        return True
+
+    def _revise_arc(self, i: int, c: Constraint, x: str, y: str) -> bool:
+        """Drop values of x without a support in y. A residue is checked with one bit test
+        before falling back to a scan of y's domain."""
+        residue = self.residues[i][x]
+        vals_x, vals_y, bit_of_y = self.values[x], self.values[y], self.bit_of[y]
+        mask_y = self.masks[y]
+        mask, removed = self.masks[x], 0
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            a = vals_x[low.bit_length() - 1]
+            b = residue.get(a)
+            if b is not None and bit_of_y[b] & mask_y:
+                continue
+            rest = mask_y
+            while rest:
+                lowy = rest & -rest
+                rest ^= lowy
+                b = vals_y[lowy.bit_length() - 1]
+                if c.pred({x: a, y: b}):
+                    residue[a] = b
+                    break
+            else:
+                removed |= low
+        if removed:
+            self._prune(x, removed)
+        return self.masks[x] != 0
 
     def _consistent_with_local(self, v: str, a: Assignment) -> bool:
         for c in self.cons_by_var[v]:
             if not c.pred(a):
+                self._fail(c, self._assigned_bits(c.scope) if self.expl is not None else 0)
                 return False
         return True
 
+    # ---------- Conflicts and nogoods ----------
+    def _assigned_bits(self, scope: Iterable[str]) -> int:
+        a, var_bit, bits = self.assignment, self.var_bit, 0
+        for u in scope:
+            if u in a:
+                bits |= var_bit[u]
+        return bits
+
+    def _explain(self, scope: Iterable[str]) -> int:
+        """Decision variables behind the current domains of scope: the assigned ones and
+        the ones that pruned the rest. Anything a constraint deduces from those domains
+        is explained by this set."""
+        a, var_bit, expl, bits = self.assignment, self.var_bit, self.expl, 0
+        for u in scope:
+            if u in var_bit:
+                bits |= expl[u]
+                if u in a:
+                    bits |= var_bit[u]
+        return bits
+
+    def _fail(self, c: Constraint, conflict: int):
+        """c failed: raise its dom/wdeg weight and keep the conflict set for backjumping."""
+        self.weights[id(c)] += 1
+        self.conflict = conflict
+
+    def _learn(self, conflict: int):
+        """Store the current values of the variables in conflict as a nogood, watching the
+        two assigned last: the search is about to undo them."""
+        var_bit = self.var_bit
+        nogood = tuple((v, val) for v, val in self.assignment.items() if conflict & var_bit[v])
+        if nogood in self.nogoods:
+            self.nogoods[nogood] = self.nogoods.pop(nogood)
+            return
+        watched = list(nogood[-2:])
+        self.nogoods[nogood] = watched
+        for lit in watched:
+            self.watches.setdefault(lit, {})[nogood] = None
+        if len(self.nogoods) > self.max_nogoods:
+            oldest = next(iter(self.nogoods))
+            for lit in self.nogoods.pop(oldest):
+                del self.watches[lit][oldest]
+
+    def _check_nogoods(self, var: str, val: Val) -> bool:
+        """Two watched literals: a nogood is only looked at when var = val makes one of its
+        watched literals true. It then watches another literal that does not hold yet; if
+        there is none, it removes the other watched literal's value (or is a conflict)."""
+        lit = (var, val)
+        watching = self.watches.get(lit)
+        if not watching:
+            return True
+        a, masks, var_bit = self.assignment, self.masks, self.var_bit
+        for nogood in list(watching):
+            watched = self.nogoods[nogood]
+            if len(watched) == 1:
+                # var can never take val
+                self.nogoods[nogood] = self.nogoods.pop(nogood)
+                self.conflict = var_bit[var]
+                return False
+            other = watched[0] if watched[1] == lit else watched[1]
+            for candidate in reversed(nogood):
+                if candidate != lit and candidate != other and a.get(candidate[0]) != candidate[1]:
+                    watched[watched.index(lit)] = candidate
+                    del watching[nogood]
+                    self.watches.setdefault(candidate, {})[nogood] = None
+                    break
+            else:
+                u, b = other
+                if u in a and a[u] != b:
+                    continue
+                # Every literal but possibly other holds: refresh the nogood as recently used
+                self.nogoods[nogood] = self.nogoods.pop(nogood)
+                reason = 0
+                for w, _ in nogood:
+                    if w != u:
+                        reason |= var_bit[w]
+                if u in a:
+                    self.conflict = reason | var_bit[u]
+                    return False
+                bit = self.bit_of[u].get(b, 0)
+                if masks[u] & bit:
+                    self.cause = reason
+                    self._prune(u, bit)
+                    if not masks[u]:
+                        self.conflict = self.expl[u]
+                        return False
+        return True
+
+    def _argmin(self, items: List[str], key: Callable[[str], float]) -> str:
+        """min(items, key=key); with a seed, a random one of the tied minima."""
+        if self.rng is None:
+            return min(items, key=key)
+        keys = [key(v) for v in items]
+        best = min(keys)
+        return self.rng.choice([v for v, k in zip(items, keys) if k == best])
+
     def _select_unassigned_variable(self):
         """Variable ordering heuristic (MRV)."""
         unassigned_vars = [v for v in self.vars if v not in self.assignment]
         if self.heuristic == 'MRV':
-            return min(unassigned_vars, key=lambda v: len(self.domains[v]))
+            masks = self.masks
+            return self._argmin(unassigned_vars, lambda v: masks[v].bit_count())
+        elif self.heuristic == 'DOMWDEG':
+            # Smallest domain size over the failure weight of the constraints still
+            # linking the variable to an unassigned one
+            masks, weights, a = self.masks, self.weights, self.assignment
+            def dom_wdeg(v):
+                wdeg = 0
+                for cid, others in self.wdeg_cons[v]:
+                    for w in others:
+                        if w not in a:
+                            wdeg += weights[cid]
+                            break
+                return masks[v].bit_count() / wdeg if wdeg else float('inf')
+            return self._argmin(unassigned_vars, dom_wdeg)
         else:
             # Default to first unassigned variable in a fixed order
-            for v in self.vars:
+            for v in self.order:
                 if v not in self.assignment:
                     return v
 
     def _get_ordered_values(self, var):
         """Value ordering heuristic (LCV)."""
         if self.heuristic == 'LCV':
-            # Count the number of domain reductions for each value
-            # and sort by least constraining
-            value_counts = []
-            for val in self.domains[var]:
-                count = 0
-                self.assignment[var] = val
-                for neighbor_cons in self.cons_by_var[var]:
-                    for neighbor in neighbor_cons.scope:
-                        if neighbor not in self.assignment:
-                            # Prune neighbors' domains and count reductions
-                            for neighbor_val in self.domains[neighbor]:
-                                temp_assignment = self.assignment.copy()
-                                temp_assignment[neighbor] = neighbor_val
-                                if not neighbor_cons.pred(temp_assignment):
-                                    count += 1
-                del self.assignment[var]
-                value_counts.append((count, val))
-            value_counts.sort() # Sort by the count
-            return [val for count, val in value_counts]
+            # Sort by least constraining: the number of neighbor values each value rules out.
+            # The ordering only depends on the domains and assignments of var's neighbors,
+            # so it is reused until one of those changes.
+            masks, assignment = self.masks, self.assignment
+            watch = self.lcv_watch[var]
+            key = (masks[var], tuple(masks[w] for w in watch), tuple(assignment.get(w) for w in watch))
+            cached = self.lcv_cache.get(var)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            vals = self.domain_values(var)
+            counts = [0] * len(vals)
+            for entry in self.lcv_pairs[var]:
+                n, c, weight, others, alldiff = entry[0], entry[1], entry[2], entry[3], entry[4]
+                if n in assignment:
+                    continue
+                live = masks[n]
+                if alldiff:
+                    # Values taken by the other assigned variables conflict with everything
+                    taken = [assignment[w] for w in others if w in assignment]
+                    bit_of = self.bit_of[n]
+                    taken_bits = 0
+                    for t in taken:
+                        taken_bits |= bit_of.get(t, 0)
+                    everything = len(taken) != len(set(taken))
+                    for i, val in enumerate(vals):
+                        if everything or val in taken:
+                            counts[i] += live.bit_count()
+                        else:
+                            counts[i] += ((bit_of.get(val, 0) | taken_bits) & live).bit_count()
+                    continue
+                # Conflict rows: per value of var, the bits of n's values that c rules out,
+                # and the bits already tested. They hold until c's other variables change.
+                context = tuple([assignment.get(w) for w in others])
+                if entry[5] != context:
+                    entry[5] = context
+                    entry[6] = {}
+                rows, nvals = entry[6], self.values[n]
+                for i, val in enumerate(vals):
+                    row = rows.get(val)
+                    if row is None:
+                        row = rows[val] = [0, 0]
+                    missing = live & ~row[0]
+                    if missing:
+                        # Test the live values not seen before, in place on the assignment
+                        row[0] |= missing
+                        assignment[var] = val
+                        while missing:
+                            low = missing & -missing
+                            missing ^= low
+                            assignment[n] = nvals[low.bit_length() - 1]
+                            if not c.pred(assignment):
+                                row[1] |= low
+                        del assignment[n]
+                        del assignment[var]
+                    counts[i] += weight * (row[1] & live).bit_count()
+            if self.rng is None:
+                ordered = [val for count, val in sorted(zip(counts, vals))]
+            else:
+                ties = [self.rng.random() for _ in vals]
+                ordered = [val for count, _, val in sorted(zip(counts, ties, vals))]
+            self.lcv_cache[var] = (key, ordered)
+            return ordered
         else:
             # Default is the domain's natural order
-            return self.domains[var]
+            vals = self.domain_values(var)
+            if self.rng is not None:
+                self.rng.shuffle(vals)
+            return vals
+
+    def _forward_check(self, var: str) -> bool:
+        """Run var's propagators, then forward check the constraints without one."""
+        explain = self.expl is not None
+        for c in self.props_by_var[var]:
+            if explain:
+                self.cause = self._explain(c.scope)
+            if not c.propagator.propagate(self, var):
+                self._fail(c, self.cause)
+                return False
+        for w, cons in self.shared[var].items():
+            if w in self.assignment:
+                continue
+            if explain:
+                self.cause = 0
+                for c in cons:
+                    self.cause |= self._assigned_bits(c.scope)
+            vals, mask, removed = self.values[w], self.masks[w], 0
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                self.assignment[w] = vals[low.bit_length() - 1]
+                for c in cons:
+                    if not c.pred(self.assignment):
+                        removed |= low
+                        culprit = c
+                        break
+                del self.assignment[w]
+            if removed:
+                self._prune(w, removed)
+            if not self.masks[w]:
+                self._fail(culprit, self.expl[w] if explain else 0)
+                return False
+        return True
+
+    def _maintain_arc_consistency(self, var: str, val: Val) -> bool:
+        """Fix var's domain to val and restore arc consistency from its constraints."""
+        others = self.masks[var] & ~self.bit_of[var][val]
+        if others:
+            self.cause = self.var_bit[var]
+            self._prune(var, others)
+        return self._arc_consistency(self.ac_by_var[var])
 
     def _backtrack(self):
+        """Yield solutions depth first. The return value is the subtree's conflict set: the
+        earlier variables whose assignments explain why it failed (-1, all of them, once it
+        found a solution). With backjumping on, a variable missing from the set returned by
+        its subtree skips its remaining values."""
         if len(self.assignment) == len(self.vars):
-            yield dict(self.assignment)
-            return
+            yield dict(self.assignment) if self.collect else None
+            return -1
 
         var = self._select_unassigned_variable()
+        bit = self.var_bit[var]
+        conflict = 0
 
         for val in self._get_ordered_values(var):
             self.assignment[var] = val
             if self._consistent_with_local(var, self.assignment):
-                # Forward check
-                pruned = []
-                ok = True
-                unassigned_neighbors = [
-                    v for c in self.cons_by_var[var] for v in c.scope
-                    if v != var and v not in self.assignment
-                ]
-                
-                for w in unassigned_neighbors:
-                    removed = []
-                    for vv in list(self.domains[w]):
-                        self.assignment[w] = vv
-                        if not self._consistent_with_local(w, self.assignment):
-                            self.domains[w].remove(vv)
-                            removed.append(vv)
-                        del self.assignment[w]
-                    if removed:
-                        pruned.append((w, removed))
-                    if not self.domains[w]:
-                        ok = False; break
-                
+                level = len(self.trail)
+                if self.inference == 'MAC':
+                    ok = self._maintain_arc_consistency(var, val)
+                else:
+                    ok = self._forward_check(var)
+                if ok and self.nogoods:
+                    ok = self._check_nogoods(var, val)
+
                 if ok:
-                    yield from self._backtrack()
+                    jump = yield from self._backtrack()
+                    if self.backjump and not jump & bit:
+                        # var played no part in the failure below; neither can its other values
+                        self._undo(level)
+                        del self.assignment[var]
+                        return jump
+                    conflict |= jump
                 else:
                     self.backtracks += 1
-                
+                    if self.backtracks >= self.cutoff:
+                        raise _Restart
+                    conflict |= self.conflict
+
                 # Undo pruning
-                for w, removed in pruned:
-                    self.domains[w].extend(removed)
+                self._undo(level)
             else:
                 self.backtracks += 1
-            
-            del self.assignment[var]
\ No newline at end of file
+                if self.backtracks >= self.cutoff:
+                    raise _Restart
+                conflict |= self.conflict
+
+            del self.assignment[var]
+
+        if self.backjump:
+            # Values pruned before var was chosen count against their pruners too
+            conflict = (conflict & ~bit) | self.expl[var]
+            if conflict > 0 and self.max_nogoods:
+                self._learn(conflict)
+        return conflict
+
+# ---------- Portfolio ----------
+DEFAULT_PORTFOLIO: List[dict] = [
+    {"heuristic": "MRV"},
+    {"heuristic": "DOMWDEG", "backjump": True},
+    {"heuristic": "LCV", "inference": "MAC"},
+    {"heuristic": "MRV", "backjump": True, "restarts": "luby", "seed": 1},
+    {"heuristic": "DOMWDEG", "backjump": True, "restarts": "luby", "seed": 2},
+    {"heuristic": "None", "inference": "MAC", "restarts": "geometric", "seed": 3},
+]
+
+def _portfolio_worker(conn, csp: CSP, config: dict):
+    solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+    start = time.perf_counter()
+    found, solution = solver.solve_backtracking(**config)
+    conn.send((found, solution, solver.backtracks, time.perf_counter() - start))
+    conn.close()
+
+def solve_portfolio(csp: CSP, configs: Optional[List[dict]] = None, timeout: Optional[float] = None,
+                    workers: Optional[int] = None) -> Tuple[bool, Optional[Assignment], Optional[dict]]:
+    """Race solve_backtracking configurations (keyword dicts, DEFAULT_PORTFOLIO by default)
+    in one process each, or only the first `workers` of them. The first to finish answers
+    for all of them, since every configuration is complete: its (found, solution) comes
+    back with a copy of its config holding 'backtracks' and 'seconds', and the others are
+    terminated. Returns (False, None, None) after timeout seconds. With fewer CPUs than
+    configurations the race is time-sliced, trading some mean latency for a worst case
+    bounded by the best configuration's. Workers are forked, so constraints need not be
+    picklable; where fork is unavailable the first configuration runs in-process."""
+    configs = configs or DEFAULT_PORTFOLIO
+    if workers is not None:
+        configs = configs[:max(1, workers)]
+    if "fork" not in multiprocessing.get_all_start_methods():
+        solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+        start = time.perf_counter()
+        found, solution = solver.solve_backtracking(**configs[0])
+        return found, solution, dict(configs[0], backtracks=solver.backtracks,
+                                     seconds=time.perf_counter() - start)
+
+    context = multiprocessing.get_context("fork")
+    running, procs = {}, []
+    for config in configs:
+        parent_end, child_end = context.Pipe(duplex=False)
+        proc = context.Process(target=_portfolio_worker, args=(child_end, csp, config), daemon=True)
+        proc.start()
+        child_end.close()
+        running[parent_end] = config
+        procs.append(proc)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while running:
+            left = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready = multiprocessing.connection.wait(list(running), left)
+            if not ready:
+                break
+            for conn in ready:
+                config = running.pop(conn)
+                try:
+                    found, solution, backtracks, seconds = conn.recv()
+                except EOFError:
+                    # The worker died (a bad config raises there); the rest keep racing
+                    continue
+                finally:
+                    conn.close()
+                return found, solution, dict(config, backtracks=backtracks, seconds=seconds)
+        return False, None, None
+    finally:
+        for conn in running:
+            conn.close()
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+# ---------- Enumeration ----------
+def solve_backtracking(csp: CSP, heuristic: str = 'None', inference: str = 'FC',
+                       **options) -> Iterator[Assignment]:
+    """Stream every solution of csp; options are CSPSolver.solutions' (backjump, seed, ...)."""
+    solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+    yield from solver.solutions(heuristic, inference, **options)
+
+def count_solutions(csp: CSP, heuristic: str = 'None', inference: str = 'FC', **options) -> int:
+    solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+    return solver.count_solutions(heuristic, inference, **options)
+
+# The job a split search's pool workers run, set just while the pool forks:
+# (csp, split variables, presolved domains, heuristic, inference, options, count only)
+_split_job: Optional[tuple] = None
+
+def _split_worker(prefix: Tuple[Val, ...]):
+    csp, split_vars, domains, heuristic, inference, options, count = _split_job
+    domains = dict(domains)
+    domains.update((v, [val]) for v, val in zip(split_vars, prefix))
+    solver = CSPSolver(list(csp.domains), domains, csp.constraints)
+    if count:
+        return solver.count_solutions(heuristic, inference, **options)
+    # Tuples in declared variable order are cheaper to send back than dicts
+    return [tuple(sol[v] for v in solver.vars) for sol in solver.solutions(heuristic, inference, **options)]
+
+def _split(csp: CSP, inference: str, split: Optional[int], workers: int):
+    """Presolve csp and split it on its first variables with more than one value left: all
+    `split` of them, or by default as many as give 8 subproblems per worker. Returns the
+    presolved domains, the split variables and the prefixes (their values in each
+    subproblem) consistent so far, or None if the presolve finds no solution."""
+    solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+    if not solver._start('None', inference, False, 0, None):
+        return None
+    domains = {v: solver.domain_values(v) for v in solver.vars}
+    split_vars: List[str] = []
+    prefixes: List[Tuple[Val, ...]] = [()]
+    for v in solver.vars:
+        if len(split_vars) == split or (split is None and len(prefixes) >= 8 * workers):
+            break
+        if len(domains[v]) < 2:
+            continue
+        extended = []
+        for prefix in prefixes:
+            solver.assignment = dict(zip(split_vars, prefix))
+            for val in domains[v]:
+                solver.assignment[v] = val
+                if solver._consistent_with_local(v, solver.assignment):
+                    extended.append(prefix + (val,))
+        split_vars.append(v)
+        prefixes = extended
+    return domains, split_vars, prefixes
+
+def _run_split(csp: CSP, heuristic: str, inference: str, workers: Optional[int],
+               split: Optional[int], options: dict, count: bool):
+    """Yield each subproblem's solution count or list of value tuples as a worker finishes it."""
+    global _split_job
+    workers = workers or multiprocessing.cpu_count()
+    job = _split(csp, inference, split, workers)
+    if job is None:
+        return
+    domains, split_vars, prefixes = job
+    _split_job = (csp, split_vars, domains, heuristic, inference, options, count)
+    try:
+        # Workers fork here and keep their own copy of the job
+        pool = multiprocessing.get_context("fork").Pool(min(workers, len(prefixes)) or 1)
+    finally:
+        _split_job = None
+    with pool:
+        yield from pool.imap_unordered(_split_worker, prefixes)
+
+def solve_parallel(csp: CSP, heuristic: str = 'None', inference: str = 'FC',
+                   workers: Optional[int] = None, split: Optional[int] = None,
+                   **options) -> Iterator[Assignment]:
+    """Stream every solution of csp like solve_backtracking, searching independent
+    subproblems in a pool of `workers` processes (one per CPU by default). The tree is split
+    on the values of its first `split` undecided variables, after presolving with inference,
+    and each subproblem is searched with the given heuristic and options. Solutions arrive
+    a subproblem at a time, in no particular order; a worker holds its subproblem's
+    solutions until it finishes, so count_parallel suits very large solution sets. Stopping
+    early terminates the pool. Workers are forked, so constraints need not be picklable;
+    where fork is unavailable, or with a single worker, the search runs in-process."""
+    if workers == 1 or "fork" not in multiprocessing.get_all_start_methods():
+        yield from solve_backtracking(csp, heuristic, inference, **options)
+        return
+    names = list(csp.domains)
+    for values in _run_split(csp, heuristic, inference, workers, split, options, False):
+        for vals in values:
+            yield dict(zip(names, vals))
+
+def count_parallel(csp: CSP, heuristic: str = 'None', inference: str = 'FC',
+                   workers: Optional[int] = None, split: Optional[int] = None, **options) -> int:
+    """The number of solutions, counted over solve_parallel's subproblems."""
+    if workers == 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return count_solutions(csp, heuristic, inference, **options)
+    return sum(_run_split(csp, heuristic, inference, workers, split, options, True))
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import re, ast
 from typing import Dict, List, Tuple
-from cs4300_csp import CSP, c_alldiff, c_bin, c_in, c_sum, c_table, c_add10
+from cs4300_csp import CSP, c_alldiff, c_bin, c_cmp, c_in, c_sum, c_table, c_add10
 
 BINOPS = {
     "eq":  ("==", lambda x,y: x == y),
@@ -11,6 +11,9 @@ BINOPS = {
     "gt":  (">",  lambda x,y: x >   y),
     "ge":  (">=", lambda x,y: x >=  y),
 }
+# The same comparison with its operands swapped, for a constant on the left
+FLIPPED = {"eq": "eq", "neq": "neq", "lt": "gt", "le": "ge", "gt": "lt", "ge": "le"}
+INT_RE = re.compile(r"^-?\d+$")
 
 def _clean(lines: List[str]) -> List[str]:
     out = []
@@ -87,7 +90,17 @@ def parse_cs4300(path: str) -> CSP:
             if ln.startswith(f"{key}(") and ln.endswith(")"):
                 body = ln[len(key)+1:-1]
                 x,y = [t.strip() for t in body.split(",")]
-                constraints.append(c_bin(op, x, y, key))
+                # Integer operands are constants, not variable names
+                if INT_RE.match(x) and INT_RE.match(y):
+                    raise ValueError(f"Constraint without variables: {ln}")
+                if INT_RE.match(x):
+                    key = FLIPPED[key]
+                    x, y = y, x
+                    op = BINOPS[key][1]
+                if INT_RE.match(y):
+                    constraints.append(c_cmp(op, x, int(y), key))
+                else:
+                    constraints.append(c_bin(op, x, y, key))
                 matched = True
                 break
         if matched:
@@ -141,4 +154,10 @@ def parse_cs4300(path: str) -> CSP:
 
         raise ValueError(f"Unknown constraint: {ln}")
 
+    # A name missing from VARS would never be assigned, silently turning its clue into a no-op
+    for c in constraints:
+        for v in c.scope:
+            if v not in domains:
+                raise ValueError(f"Undeclared variable {v} in {c.get_description()}")
+
     return CSP(domains=domains, constraints=constraints)
@@ -5,7 +5,9 @@ import time
 # Assuming these modules are in the same directory as run.py
 import cs4300_csp
 import cs4300_csp_parser
-from cs4300_csp import CSPSolver
+from cs4300_csp import CSPSolver, solve_portfolio
+
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Instances")
 
 def run_solver(filepath, heuristic):
     """
@@ -13,19 +15,26 @@ def run_solver(filepath, heuristic):
     """
     try:
         # Load the CSP problem
-        vars, domains, constraints = cs4300_csp_parser.parse(filepath)
+        csp = cs4300_csp_parser.parse_cs4300(filepath)
+        vars, domains, constraints = list(csp.domains), csp.domains, csp.constraints
         print(f"Loading and solving {filepath} with {heuristic} heuristic...\n")
 
-        # Initialize the solver with the chosen heuristic
-        solver = CSPSolver(vars, domains, constraints)
-
         # Measure the runtime
         start_time = time.time()
-        solution_found, solution = solver.solve_backtracking(heuristic=heuristic)
+        if heuristic == "PORTFOLIO":
+            # Race several heuristics and restart seeds; the first to finish wins
+            solution_found, solution, winner = solve_portfolio(csp)
+            search_steps = winner["backtracks"] if winner else 0
+            if winner:
+                print(f"Portfolio winner: {winner}\n")
+        else:
+            # Initialize the solver with the chosen heuristic
+            solver = CSPSolver(vars, domains, constraints)
+            solution_found, solution = solver.solve_backtracking(heuristic=heuristic)
+            search_steps = solver.backtracks
         end_time = time.time()
 
         runtime = end_time - start_time
-        search_steps = solver.backtracks
 
         # Formalize the problem for the report
         report_vars = "\n".join([f"  - {v}: {list(domains[v])}" for v in sorted(vars)])
@@ -68,7 +77,7 @@ def run_solver(filepath, heuristic):
             print("\n  No solution found.")
 
     except FileNotFoundError:
-        print(f"Error: The file '{filepath}' was not found. Please make sure it exists in the 'instances/' directory.")
+        print(f"Error: The file '{filepath}' was not found. Please make sure it exists in the 'Instances/' directory.")
         sys.exit(1)
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -77,8 +86,8 @@ def run_solver(filepath, heuristic):
 if __name__ == "__main__":
     print("Welcome to the Zebra Puzzle Solver.")
     
-    heuristic_choice = input("Choose a heuristic (None, MRV, LCV): ")
-    if heuristic_choice.upper() not in ["NONE", "MRV", "LCV"]:
+    heuristic_choice = input("Choose a heuristic (None, MRV, LCV, DOMWDEG, Portfolio): ")
+    if heuristic_choice.upper() not in ["NONE", "MRV", "LCV", "DOMWDEG", "PORTFOLIO"]:
         print("Invalid heuristic choice. Exiting.")
         sys.exit(1)
     heuristic = heuristic_choice.upper() if heuristic_choice.upper() != "NONE" else None
@@ -97,11 +106,11 @@ if __name__ == "__main__":
         instance_choice = input("Enter your choice (a, b, or c): ")
         
         if instance_choice == 'a':
-            file_path = "instances/threeHouseA.csp"
+            file_path = os.path.join(INSTANCE_DIR, "threeHouseA.csp")
         elif instance_choice == 'b':
-            file_path = "instances/threeHouseB.csp"
+            file_path = os.path.join(INSTANCE_DIR, "threeHouseB.csp")
         elif instance_choice == 'c':
-            file_path = "instances/threeHouseC.csp"
+            file_path = os.path.join(INSTANCE_DIR, "threeHouseC.csp")
         else:
             print("Invalid instance choice. Exiting.")
             sys.exit(1)
@@ -112,9 +121,9 @@ if __name__ == "__main__":
         instance_choice = input("Enter your choice (a or b): ")
 
         if instance_choice == 'a':
-            file_path = "instances/fiveHouseA.csp"
+            file_path = os.path.join(INSTANCE_DIR, "fiveHouseA.csp")
         elif instance_choice == 'b':
-            file_path = "instances/fiveHouseB.csp"
+            file_path = os.path.join(INSTANCE_DIR, "fiveHouseB.csp")
         else:
             print("Invalid instance choice. Exiting.")
             sys.exit(1)
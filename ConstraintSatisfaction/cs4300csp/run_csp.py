@@ -1,15 +1,38 @@
+import argparse
+
 from cs4300_csp_parser import parse_cs4300
-from cs4300_csp import solve_backtracking
+from cs4300_csp import solve_backtracking, solve_parallel, count_solutions, count_parallel, presolve
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python run_csp.py <problem.csp>")
-        sys.exit(1)
-    csp = parse_cs4300(sys.argv[1])
-    any_sol = False
-    for i, sol in enumerate(solve_backtracking(csp), 1):
-        any_sol = True
-        print(f"Solution #{i}: {sol}")
-    if not any_sol:
-        print("No solutions.")
+    parser = argparse.ArgumentParser(description="Print (or count) every solution of a CS4300-CSP problem")
+    parser.add_argument("problem", help="path to a .csp file")
+    parser.add_argument("--heuristic", default="None", choices=["None", "MRV", "LCV", "DOMWDEG"])
+    parser.add_argument("--inference", default="FC", choices=["FC", "AC", "MAC"])
+    parser.add_argument("--backjump", action="store_true", help="conflict-directed backjumping")
+    parser.add_argument("--count", action="store_true", help="only print the number of solutions")
+    parser.add_argument("--presolve", action="store_true",
+                        help="merge eq() variables and fold unary constraints before searching")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="split the search over this many processes (0: one per CPU)")
+    parser.add_argument("--split", type=int, default=None, help="with --workers: variables to split on")
+    args = parser.parse_args()
+
+    csp = parse_cs4300(args.problem)
+    expand = lambda sol: sol
+    if args.presolve:
+        reduced = presolve(csp)
+        csp, expand = reduced.csp, reduced.expand
+    options = dict(heuristic=args.heuristic, inference=args.inference, backjump=args.backjump)
+    if args.workers is not None:
+        options.update(workers=args.workers or None, split=args.split)
+    if args.count:
+        count = count_parallel if args.workers is not None else count_solutions
+        print(f"Solutions: {count(csp, **options)}")
+    else:
+        solve = solve_parallel if args.workers is not None else solve_backtracking
+        any_sol = False
+        for i, sol in enumerate(solve(csp, **options), 1):
+            any_sol = True
+            print(f"Solution #{i}: {expand(sol)}")
+        if not any_sol:
+            print("No solutions.")
@@ -0,0 +1,86 @@
+import itertools
+import operator
+
+import pytest
+
+from cs4300_csp import (CSP, CSPSolver, c_alldiff, c_bin, c_table, count_parallel,
+                        count_solutions, solve_backtracking, solve_parallel)
+
+def queens(n):
+    names = [f"Q{i}" for i in range(n)]
+    constraints = [c_alldiff(names)]
+    for i, j in itertools.combinations(range(n), 2):
+        constraints.append(c_bin(lambda a, b, d=j - i: abs(a - b) != d, names[i], names[j], "diag"))
+    return CSP({v: list(range(n)) for v in names}, constraints)
+
+def adjacent_table_csp():
+    # A ring of "neighbours differ by exactly 1" tables
+    names = [f"X{i}" for i in range(6)]
+    rows = [(a, b) for a in range(5) for b in range(5) if abs(a - b) == 1]
+    constraints = [c_table([names[i], names[(i + 1) % 6]], rows) for i in range(6)]
+    return CSP({v: list(range(5)) for v in names}, constraints)
+
+def ternary_table_csp():
+    # Small enough to check by hand; interleaved searches once lost one of its 4 solutions
+    domains = {"V0": [0, 1, 2, 3], "V1": [0, 1, 2, 3], "V2": [1, 2, 3], "V3": [0, 2, 3]}
+    return CSP(domains, [
+        c_table(["V3", "V0", "V1"], [(0, 2, 1), (1, 3, 0), (2, 2, 0), (2, 3, 0), (3, 0, 2),
+                                     (3, 0, 3), (3, 2, 1), (3, 2, 3), (3, 3, 1), (3, 3, 3)]),
+        c_table(["V2", "V1", "V3"], [(0, 1, 0), (2, 0, 2), (2, 1, 0), (3, 1, 0)]),
+    ])
+
+def test_counts_match_enumeration():
+    csp = queens(7)
+    solutions = list(solve_backtracking(csp, "MRV"))
+    assert len(solutions) == 40
+    assert len({tuple(s.values()) for s in solutions}) == 40
+    for heuristic in ("None", "MRV", "LCV", "DOMWDEG"):
+        for inference in ("FC", "AC", "MAC"):
+            assert count_solutions(csp, heuristic, inference) == 40
+            assert count_solutions(csp, heuristic, inference, backjump=True) == 40
+
+def test_concurrent_generators_on_a_table_csp():
+    for csp in (ternary_table_csp(), adjacent_table_csp()):
+        serial = sorted(tuple(s.values()) for s in solve_backtracking(csp))
+        assert len(serial) == count_solutions(csp) > 0
+        first = solve_backtracking(csp, "None", "MAC")
+        second = solve_backtracking(csp, "MRV", "FC")
+        seen_first, seen_second = [], []
+        for a, b in itertools.zip_longest(first, second):
+            if a is not None:
+                seen_first.append(tuple(a[v] for v in csp.domains))
+            if b is not None:
+                seen_second.append(tuple(b[v] for v in csp.domains))
+        assert sorted(seen_first) == serial
+        assert sorted(seen_second) == serial
+
+def test_generator_stopped_early_leaves_solver_reusable():
+    csp = queens(6)
+    solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+    stream = solver.solutions("MRV", "MAC")
+    next(stream)
+    stream.close()
+    assert solver.count_solutions() == 4
+    found, solution = solver.solve_backtracking("MRV")
+    assert found and all(c.pred(solution) for c in csp.constraints)
+
+def test_restarts_are_rejected_while_enumerating():
+    with pytest.raises(TypeError):
+        list(solve_backtracking(queens(4), restarts="luby"))
+
+def test_parallel_matches_serial():
+    csp = queens(7)
+    serial = sorted(tuple(s.values()) for s in solve_backtracking(csp))
+    for split in (None, 1, 3):
+        parallel = sorted(tuple(s[v] for v in csp.domains) for s in solve_parallel(csp, workers=2, split=split))
+        assert parallel == serial
+        assert count_parallel(csp, "MRV", "AC", workers=3, split=split) == len(serial)
+    table = adjacent_table_csp()
+    assert count_parallel(table, workers=2) == count_solutions(table)
+
+def test_unsatisfiable_problem_yields_nothing():
+    csp = CSP({"A": [1, 2], "B": [1, 2], "C": [1, 2]},
+              [c_alldiff(["A", "B", "C"]), c_bin(operator.lt, "A", "B", "lt")])
+    assert list(solve_backtracking(csp)) == []
+    assert count_solutions(csp, "MRV", "MAC") == 0
+    assert count_parallel(csp, workers=2) == 0
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from cs4300_csp import count_solutions
+from cs4300_csp_parser import parse_cs4300
+
+INSTANCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Instances")
+
+def test_undeclared_variable_is_rejected(tmp_path):
+    path = tmp_path / "typo.csp"
+    path.write_text("VARS:\n  A: [0,1]\n  B: [0,1]\nCONS:\n  neq(A,B)\n  neq(A,C)\n")
+    with pytest.raises(ValueError, match="Undeclared variable C"):
+        parse_cs4300(str(path))
+
+def test_every_instance_declares_its_variables():
+    for name in sorted(os.listdir(INSTANCES)):
+        if name.endswith(".csp"):
+            parse_cs4300(os.path.join(INSTANCES, name))
+
+def test_zebra_counts():
+    # Every clue constrains something, so B has fewer solutions than with Green/White unbound
+    assert count_solutions(parse_cs4300(os.path.join(INSTANCES, "fiveHouseA.csp")), inference="MAC") == 0
+    assert count_solutions(parse_cs4300(os.path.join(INSTANCES, "fiveHouseB.csp")), inference="MAC") == 1728
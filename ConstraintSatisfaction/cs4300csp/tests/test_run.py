@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+RUN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run.py")
+MENU = [("1", "a"), ("1", "b"), ("1", "c"), ("2", "a"), ("2", "b")]
+
+@pytest.mark.parametrize("heuristic", ["None", "MRV", "LCV", "DOMWDEG", "Portfolio"])
+def test_every_menu_entry_prints_a_report(heuristic, tmp_path):
+    for puzzle, instance in MENU:
+        # From another directory, so instance paths must not depend on the cwd
+        result = subprocess.run([sys.executable, RUN], input=f"{heuristic}\n{puzzle}\n{instance}\n",
+                                capture_output=True, text=True, cwd=tmp_path, timeout=120)
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Search Steps (Backtracks):" in result.stdout
+        assert "Solution Found" in result.stdout or "No solution found" in result.stdout
@@ -0,0 +1,151 @@
+import itertools
+import operator
+import os
+import random
+
+from cs4300_csp import (CSP, CSPSolver, c_alldiff, c_bin, c_cmp, c_in, c_linear, c_sum, c_table,
+                        count_parallel, count_solutions, presolve, solve_backtracking,
+                        solve_parallel, solve_portfolio)
+from cs4300_csp_parser import parse_cs4300
+
+HEURISTICS = ("None", "MRV", "LCV", "DOMWDEG")
+INFERENCES = ("FC", "AC", "MAC")
+INSTANCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Instances")
+
+def random_csp(rng, merges=False):
+    names = [f"V{i}" for i in range(rng.randint(2, 6))]
+    domains = {v: rng.sample(range(-2, 5), rng.randint(1, 4)) for v in names}
+    kinds = ["sum", "linear", "table", "bin", "alldiff", "in", "custom"]
+    if merges:
+        kinds += ["eq", "eq", "const"]
+    constraints = []
+    for _ in range(rng.randint(1, 6)):
+        kind = rng.choice(kinds)
+        scope = rng.sample(names, 2 if kind in ("bin", "eq") else rng.randint(1, len(names)))
+        if kind == "sum":
+            constraints.append(c_sum(scope, rng.choice(["==", "!=", "<=", "<", ">=", ">"]), rng.randint(-3, 8)))
+        elif kind == "linear":
+            constraints.append(c_linear(scope, [rng.randint(-2, 2) for _ in scope],
+                                        rng.choice(["==", "<=", "!="]), rng.randint(-3, 3)))
+        elif kind == "table":
+            rows = [tuple(rng.randint(-2, 4) for _ in scope) for _ in range(rng.randint(1, 8))]
+            constraints.append(c_table(scope, rows))
+        elif kind == "bin":
+            constraints.append(c_bin(rng.choice([operator.lt, operator.ne]), scope[0], scope[1], "x"))
+        elif kind == "eq":
+            constraints.append(c_bin(operator.eq, scope[0], scope[1], "eq"))
+        elif kind == "const":
+            constraints.append(c_cmp(operator.eq, scope[0], rng.randint(-2, 4), "eq"))
+        elif kind == "in":
+            constraints.append(c_in(scope[0], rng.sample(range(-2, 5), 3)))
+        elif kind == "custom":
+            # No propagator: only checked once its scope is assigned
+            c = c_sum(scope, "<=", rng.randint(0, 6))
+            c.propagator = None
+            constraints.append(c)
+        else:
+            constraints.append(c_alldiff(scope))
+    return CSP(domains, constraints)
+
+def brute_force(csp):
+    names = list(csp.domains)
+    return sorted(combo for combo in itertools.product(*csp.domains.values())
+                  if all(c.pred(dict(zip(names, combo))) for c in csp.constraints))
+
+def as_tuples(csp, solutions):
+    return sorted(tuple(sol[v] for v in csp.domains) for sol in solutions)
+
+def check(csp, expected, heuristic, inference, **options):
+    """Every solution streamed, and the single one solve_backtracking returns, against brute force."""
+    assert as_tuples(csp, solve_backtracking(csp, heuristic, inference, **options)) == expected
+    found, solution = CSPSolver(list(csp.domains), csp.domains, csp.constraints
+                                ).solve_backtracking(heuristic, inference, **options)
+    assert found == bool(expected)
+    assert not found or tuple(solution[v] for v in csp.domains) in expected
+
+def random_cases(seed, count, merges=False):
+    rng = random.Random(seed)
+    for _ in range(count):
+        csp = random_csp(rng, merges)
+        yield csp, brute_force(csp)
+
+def test_propagators_match_brute_force():
+    for csp, expected in random_cases(5, 150):
+        for heuristic in ("None", "MRV"):
+            check(csp, expected, heuristic, "FC")
+
+def test_arc_consistency_matches_brute_force():
+    for csp, expected in random_cases(6, 150):
+        for heuristic in ("None", "MRV"):
+            for inference in ("AC", "MAC"):
+                check(csp, expected, heuristic, inference)
+
+def test_lcv_matches_brute_force():
+    for csp, expected in random_cases(7, 150):
+        for inference in INFERENCES:
+            check(csp, expected, "LCV", inference)
+
+def test_backjumping_matches_brute_force():
+    for csp, expected in random_cases(8, 100):
+        check(csp, expected, "DOMWDEG", "FC")
+        for heuristic in HEURISTICS:
+            for inference in INFERENCES:
+                check(csp, expected, heuristic, inference, backjump=True)
+                # A nogood store small enough to evict
+                check(csp, expected, heuristic, inference, backjump=True, max_nogoods=2)
+
+def test_restarts_and_seeds_stay_complete():
+    restarts = 0
+    for trial, (csp, expected) in enumerate(random_cases(9, 40)):
+        for heuristic in HEURISTICS:
+            for backjump in (False, True):
+                for schedule in (None, "luby", "geometric"):
+                    solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+                    found, solution = solver.solve_backtracking(heuristic, "FC", backjump, seed=trial,
+                                                                restarts=schedule, restart_base=1)
+                    restarts += solver.restarts
+                    assert found == bool(expected)
+                    assert not found or tuple(solution[v] for v in csp.domains) in expected
+        # A seed only reorders the search
+        check(csp, expected, "None", "MAC", seed=trial)
+    assert restarts > 0
+
+def test_seeded_solves_repeat_on_a_reused_solver():
+    csp = parse_cs4300(os.path.join(INSTANCES, "fiveHouseB.csp"))
+    for options in ({"seed": 7}, {"seed": 3, "restarts": "luby", "restart_base": 10}):
+        fresh = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+        fresh.solve_backtracking("LCV", "FC", **options)
+        reused = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+        for _ in range(3):
+            reused.solve_backtracking("LCV", "FC", **options)
+            assert (reused.backtracks, reused.restarts) == (fresh.backtracks, fresh.restarts)
+
+def test_portfolio_answers_like_brute_force():
+    for csp, expected in random_cases(4, 3):
+        found, solution, config = solve_portfolio(csp)
+        assert found == bool(expected)
+        assert not found or tuple(solution[v] for v in csp.domains) in expected
+        assert "backtracks" in config
+
+def test_counts_match_brute_force():
+    for csp, expected in random_cases(10, 60):
+        for heuristic in HEURISTICS:
+            for inference in INFERENCES:
+                for backjump in (False, True):
+                    assert count_solutions(csp, heuristic, inference, backjump=backjump) == len(expected)
+
+def test_parallel_search_matches_brute_force():
+    for csp, expected in random_cases(3, 4):
+        assert count_parallel(csp, "MRV", "FC", workers=2) == len(expected)
+        assert count_parallel(csp, "None", "MAC", workers=2, split=1, backjump=True) == len(expected)
+        assert as_tuples(csp, solve_parallel(csp, "DOMWDEG", "FC", workers=2)) == expected
+
+def test_presolve_keeps_the_solutions():
+    merged = 0
+    for csp, expected in random_cases(11, 150, merges=True):
+        reduced = presolve(csp)
+        merged += len(reduced.csp.domains) < len(csp.domains)
+        for heuristic, inference in (("None", "FC"), ("MRV", "MAC"), ("DOMWDEG", "AC")):
+            solutions = (reduced.expand(s) for s in solve_backtracking(reduced.csp, heuristic, inference))
+            assert as_tuples(csp, solutions) == expected
+    assert merged > 0
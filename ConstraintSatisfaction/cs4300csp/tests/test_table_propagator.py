@@ -0,0 +1,61 @@
+import itertools
+import random
+
+from cs4300_csp import CSP, CSPSolver, c_alldiff, c_table, solve_backtracking
+
+def random_table_csp(rng):
+    names = [f"V{i}" for i in range(rng.randint(3, 5))]
+    domains = {v: rng.sample(range(4), rng.randint(2, 4)) for v in names}
+    constraints = []
+    for _ in range(rng.randint(2, 4)):
+        scope = rng.sample(names, rng.randint(2, 3))
+        rows = [tuple(rng.randrange(4) for _ in scope) for _ in range(rng.randint(4, 20))]
+        constraints.append(c_table(scope, rows))
+    if rng.random() < 0.5:
+        constraints.append(c_alldiff(rng.sample(names, 2)))
+    return CSP(domains, constraints)
+
+def brute_force(csp):
+    names = list(csp.domains)
+    return sorted(combo for combo in itertools.product(*csp.domains.values())
+                  if all(c.pred(dict(zip(names, combo))) for c in csp.constraints))
+
+def as_tuples(csp, solutions):
+    return sorted(tuple(sol[v] for v in csp.domains) for sol in solutions)
+
+def test_table_constraints_match_brute_force():
+    rng = random.Random(0)
+    for _ in range(100):
+        csp = random_table_csp(rng)
+        expected = brute_force(csp)
+        for inference in ("FC", "AC", "MAC"):
+            assert as_tuples(csp, solve_backtracking(csp, "MRV", inference)) == expected
+
+def test_interleaved_searches_share_constraints_safely():
+    # Two solvers over the same Constraint objects, advanced in lockstep
+    rng = random.Random(1)
+    for _ in range(200):
+        csp = random_table_csp(rng)
+        first = solve_backtracking(csp, "None", "MAC")
+        second = solve_backtracking(csp, "MRV", "FC")
+        found_first, found_second = [], []
+        for a, b in itertools.zip_longest(first, second):
+            if a is not None:
+                found_first.append(a)
+            if b is not None:
+                found_second.append(b)
+        expected = brute_force(csp)
+        assert as_tuples(csp, found_first) == expected
+        assert as_tuples(csp, found_second) == expected
+
+def test_solver_reused_after_another_solver_ran():
+    rng = random.Random(2)
+    for _ in range(50):
+        csp = random_table_csp(rng)
+        solver = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+        paused = solver.solutions("None", "AC")
+        first = next(paused, None)
+        other = CSPSolver(list(csp.domains), csp.domains, csp.constraints)
+        other.count_solutions("MRV", "MAC")
+        rest = [first] + list(paused) if first is not None else []
+        assert as_tuples(csp, rest) == brute_force(csp)
@@ -0,0 +1,157 @@
+# benchmark.py
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+from riverCrossing import randomInstance
+from searchCore import bfs, ids, bidirectional_bfs, parallel_bfs
+
+DEFAULT_SIZES = (6, 8, 10, 12)
+DEFAULT_ENGINES = ("bfs", "bidir", "ids")
+IDS_TABLE_SIZE = 100000
+# Metrics compared against a baseline, and whether a larger value is an improvement
+COMPARED = (("nodesExpanded", False), ("wallP50", False), ("wallP90", False),
+            ("nodesPerSecond", True), ("peakBytes", False))
+
+def run_engine(engine, problem, workers=None):
+    """Solve one river-crossing instance; returns (path, stats, seconds)."""
+    start, goal = problem.initialState(), problem.goalState()
+    goalTest = lambda s: s == goal
+    t = time.perf_counter()
+    if engine == "bfs":
+        path, stats = bfs(start, goalTest, problem.successors)
+    elif engine == "bidir":
+        path, stats = bidirectional_bfs(start, goal, problem.successors)
+    elif engine == "ids":
+        path, stats = ids(start, goalTest, problem.successors, table_size=IDS_TABLE_SIZE)
+    elif engine == "pbfs":
+        path, stats = parallel_bfs(start, goalTest, problem.successors, workers)
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+    return path, stats, time.perf_counter() - t
+
+def peak_bytes(engine, problem, workers=None):
+    """Peak traced allocation of one untimed run (tracemalloc would skew the timings)."""
+    tracemalloc.start()
+    try:
+        run_engine(engine, problem, workers)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list: the smallest value with at
+    least p percent of the list at or below it."""
+    rank = math.ceil(p / 100 * len(values))
+    return values[min(len(values), max(1, rank)) - 1]
+
+def summarize(times, expanded, peaks, depths):
+    times = sorted(times)
+    total = sum(times)
+    return {
+        "instances": len(expanded),
+        "runs": len(times),
+        "depth": sum(depths) / len(depths),
+        "nodesExpanded": sum(expanded) / len(expanded),
+        "nodesPerSecond": sum(expanded) * len(times) / len(expanded) / total if total else 0.0,
+        "wallMean": total / len(times),
+        "wallP50": percentile(times, 50),
+        "wallP90": percentile(times, 90),
+        "wallP99": percentile(times, 99),
+        "peakBytes": max(peaks),
+    }
+
+def run_benchmark(engines, sizes, per_size=3, seed=0, repeat=3, warmup=1, capacity=2,
+                  workers=None, memory=True, log=sys.stderr):
+    """Every engine on per_size seeded instances of each item count; keys are engine/items-N."""
+    results = {}
+    for engine in engines:
+        warm = randomInstance(min(sizes), capacity, seed=seed)
+        for _ in range(warmup):
+            run_engine(engine, warm, workers)
+        for n in sizes:
+            times, expanded, peaks, depths = [], [], [], []
+            for i in range(per_size):
+                problem = randomInstance(n, capacity, seed=seed + i)
+                for _ in range(repeat):
+                    path, stats, seconds = run_engine(engine, problem, workers)
+                    times.append(seconds)
+                expanded.append(stats.expanded)
+                depths.append(len(path) if path is not None else -1)
+                peaks.append(peak_bytes(engine, problem, workers) if memory else 0)
+            key = f"{engine}/items-{n}"
+            results[key] = summarize(times, expanded, peaks, depths)
+            print(f"{key}: p50 {results[key]['wallP50'] * 1000:.2f} ms, "
+                  f"{results[key]['nodesExpanded']:.0f} nodes", file=log)
+    return results
+
+def compare(current, baseline, threshold=0.10, out=sys.stdout):
+    """Print every metric that moved, flag changes beyond threshold; returns the regressions."""
+    regressions = []
+    for field in ("seed", "perSize", "capacity"):
+        if current["meta"].get(field) != baseline.get("meta", {}).get(field):
+            print(f"warning: baseline {field} differs, instances are not the same", file=out)
+    for key in sorted(current["results"]):
+        old = baseline["results"].get(key)
+        if old is None:
+            print(f"{key}: new, no baseline", file=out)
+            continue
+        for metric, higherIsBetter in COMPARED:
+            before, after = old.get(metric), current["results"][key][metric]
+            if not before or before == after:
+                continue
+            change = (after - before) / before
+            worse = -change if higherIsBetter else change
+            flag = "REGRESSION" if worse > threshold else "improved" if worse < -threshold else ""
+            print(f"{key} {metric}: {before:.6g} -> {after:.6g} ({change:+.1%}) {flag}".rstrip(), file=out)
+            if flag == "REGRESSION":
+                regressions.append((key, metric, change))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seeded river-crossing benchmark over growing item counts")
+    parser.add_argument("--engines", nargs="+", default=list(DEFAULT_ENGINES),
+                        choices=["bfs", "bidir", "ids", "pbfs"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="item counts")
+    parser.add_argument("--per-size", type=int, default=3, help="instances per item count")
+    parser.add_argument("--capacity", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per instance")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per engine")
+    parser.add_argument("--workers", type=int, default=None, help="pbfs: worker processes")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory runs")
+    parser.add_argument("--output", default="benchmark.json", help="results file ('-' for stdout)")
+    parser.add_argument("--baseline", default=None, help="earlier results file to diff against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change flagged by --baseline")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if --baseline finds a regression")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "seed": args.seed,
+            "perSize": args.per_size,
+            "capacity": args.capacity,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": run_benchmark(args.engines, args.sizes, args.per_size, args.seed, args.repeat,
+                                 args.warmup, args.capacity, args.workers, not args.no_memory),
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
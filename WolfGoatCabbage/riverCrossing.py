@@ -0,0 +1,105 @@
+import random
+from itertools import combinations
+
+from wgc import State, LEFT, RIGHT
+
+# Generalized river crossing with N items, a boat carrying up to `capacity` items
+# besides the farmer, and a conflict graph of item pairs that cannot be left alone.
+# A state is an int: bit i is set when item i is on the right bank, bit N when the boat is.
+VALIDITY_TABLE_MAX_ITEMS = 22  # precompute a byte per state up to 2**23 states
+
+class RiverCrossing:
+    def __init__(self, items, capacity=1, conflicts=()):
+        self.items = list(items)
+        self.n = len(self.items)
+        self.capacity = capacity
+        self.boatBit = 1 << self.n
+        self.itemMask = self.boatBit - 1
+        index = {name: i for i, name in enumerate(self.items)}
+        self.conflictMasks = [(1 << index[a]) | (1 << index[b]) for a, b in conflicts]
+
+        # Action label for every load the boat can carry (mask 0 = farmer crosses alone)
+        self.loadNames = {0: "Cross alone"}
+        for k in range(1, capacity + 1):
+            for group in combinations(range(self.n), k):
+                mask = 0
+                for i in group:
+                    mask |= 1 << i
+                self.loadNames[mask] = "Take " + " & ".join(self.items[i] for i in group)
+        self.bits = [1 << i for i in range(self.n)]
+
+        self.validTable = None
+        if self.n <= VALIDITY_TABLE_MAX_ITEMS:
+            self.validTable = bytearray(self._checkMasks(s) for s in range(self.boatBit << 1))
+
+    def initialState(self):
+        return 0
+
+    def goalState(self):
+        return self.boatBit | self.itemMask
+
+    def numStates(self):
+        return self.boatBit << 1
+
+    def _checkMasks(self, state):
+        # Items on the bank without the boat are unattended
+        if state & self.boatBit:
+            unattended = ~state & self.itemMask
+        else:
+            unattended = state & self.itemMask
+        for mask in self.conflictMasks:
+            if unattended & mask == mask:
+                return False
+        return True
+
+    def isValid(self, state):
+        if self.validTable is not None:
+            return bool(self.validTable[state])
+        return self._checkMasks(state)
+
+    def successors(self, state):
+        """Valid (action, nextState) pairs; plugs straight into bfs/ids."""
+        if state & self.boatBit:
+            onBoatSide = state & self.itemMask
+        else:
+            onBoatSide = ~state & self.itemMask
+        flipBoat = state ^ self.boatBit
+        valid = self.validTable
+        names = self.loadNames
+        present = [b for b in self.bits if onBoatSide & b]
+        moves = []
+        for k in range(min(self.capacity, len(present)) + 1):
+            for group in combinations(present, k):
+                mask = sum(group)
+                nextState = flipBoat ^ mask
+                if (valid[nextState] if valid is not None else self._checkMasks(nextState)):
+                    moves.append((names[mask], nextState))
+        return moves
+
+    def formatState(self, state):
+        sides = [RIGHT if state & (1 << i) else LEFT for i in range(self.n + 1)]
+        return "(" + ", ".join([sides[self.n]] + sides[:self.n]) + ")"
+
+def wolfGoatCabbage():
+    """The classic puzzle as the N=3 special case."""
+    return RiverCrossing(["Wolf", "Goat", "Cabbage"], capacity=1,
+                         conflicts=[("Wolf", "Goat"), ("Goat", "Cabbage")])
+
+def fromWGCState(state: State):
+    """Encode a wgc.State (B, W, G, C) for the wolfGoatCabbage() domain."""
+    packed = 0
+    for i, side in enumerate((state.W, state.G, state.C, state.B)):
+        if side == RIGHT:
+            packed |= 1 << i
+    return packed
+
+def randomInstance(n, capacity=2, edgeProbability=0.5, seed=0):
+    """Seeded benchmark instance: the first capacity-1 items are predators, each in conflict
+    with a random subset of the rest, so the farmer can always ferry the predators.
+    With capacity=2, n=20 reaches about 1M states and n=21 about 2M."""
+    rng = random.Random(seed)
+    items = [f"I{i}" for i in range(n)]
+    predators = items[:max(1, capacity - 1)]
+    conflicts = [(p, q) for p in predators for q in items[len(predators):]
+                 if rng.random() < edgeProbability]
+    return RiverCrossing(items, capacity, conflicts)
@@ -1,20 +1,38 @@
 # run.py
 import argparse
-from wgc import initialState, goalState, successors, formatState
-from searchCore import bfs, ids
+import wgc
+from riverCrossing import randomInstance
+from searchCore import bfs, ids, bidirectional_bfs, parallel_bfs
+from searchObserver import SearchObserver
 
-def run(domain, algo):
+def run(domain, algo, items=20, capacity=2, seed=0, workers=None, profile=None):
+    if domain == "RIVER":
+        problem = randomInstance(items, capacity, seed=seed)
+    else:
+        problem = wgc
+    initialState, goalState = problem.initialState, problem.goalState
+    successors, formatState = problem.successors, problem.formatState
     start = initialState()
     goalTest = lambda s: s == goalState()
+    observer = SearchObserver() if profile else None
+    if observer is not None and algo not in ("bfs", "ids"):
+        raise ValueError("--profile supports bfs and ids")
 
     if algo == "bfs":
-        path, stats = bfs(start, goalTest, successors)
+        path, stats = bfs(start, goalTest, successors, observer=observer)
     elif algo == "ids":
-        path, stats = ids(start, goalTest, successors)
+        path, stats = ids(start, goalTest, successors, observer=observer)
+    elif algo == "pbfs":
+        path, stats = parallel_bfs(start, goalTest, successors, workers)
+    elif algo == "bidir":
+        path, stats = bidirectional_bfs(start, goalState(), successors)
     else:
         raise ValueError("Unknown algorithm")
 
     print(f"Domain: {domain} | Algorithm: {algo.upper()}")
+    if observer is not None:
+        observer.to_json(profile)
+        print(f"Profile written to {profile}")
     if path is None:
         print("No solution found.")
         return
@@ -29,7 +47,12 @@ def run(domain, algo):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--domain", default="WGC")
-    parser.add_argument("--algo", choices=["bfs", "ids"], required=True)
+    parser.add_argument("--domain", default="WGC", choices=["WGC", "RIVER"])
+    parser.add_argument("--items", type=int, default=20, help="RIVER: number of items")
+    parser.add_argument("--capacity", type=int, default=2, help="RIVER: items per boat trip")
+    parser.add_argument("--seed", type=int, default=0, help="RIVER: conflict graph seed")
+    parser.add_argument("--workers", type=int, default=None, help="pbfs: worker processes")
+    parser.add_argument("--algo", choices=["bfs", "ids", "bidir", "pbfs"], required=True)
+    parser.add_argument("--profile", default=None, help="bfs/ids: write per-phase timings as JSON")
     args = parser.parse_args()
-    run(args.domain, args.algo)
+    run(args.domain, args.algo, args.items, args.capacity, args.seed, args.workers, args.profile)
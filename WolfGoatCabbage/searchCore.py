@@ -1,62 +1,481 @@
-from collections import deque
+import functools
+import heapq
+import inspect
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+from collections import OrderedDict, deque
 
 class SearchStats:
     def __init__(self):
         self.generated = 0
         self.expanded = 0
         self.maxFrontier = 0
+        self.cacheHits = 0
+        self.cacheMisses = 0
 
-def bfs(start, goalTest, successors):
+class CachedSuccessors:
+    """Opt-in memoizing wrapper around a successor function with LRU eviction.
+
+    Bounded by max_entries and, optionally, by max_bytes (a sys.getsizeof estimate of
+    the cached states and actions). Results are stored as tuples, so callers share them
+    safely. Engines copy the hits/misses of a search into its SearchStats.
+    """
+    def __init__(self, successors, max_entries=100000, max_bytes=None):
+        self.successors = successors
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()   # state -> (moves, estimated bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, state):
+        entry = self.cache.get(state)
+        if entry is not None:
+            self.hits += 1
+            self.cache.move_to_end(state)
+            return entry[0]
+        self.misses += 1
+        moves = tuple(self.successors(state))
+        size = 0
+        if self.max_bytes is not None:
+            size = sys.getsizeof(moves) + sys.getsizeof(state)
+            for action, nextState in moves:
+                size += sys.getsizeof(action) + sys.getsizeof(nextState)
+        self.cache[state] = (moves, size)
+        self.bytes += size
+        while self.cache and (len(self.cache) > self.max_entries or
+                              (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, evicted) = self.cache.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+        return moves
+
+    def clear(self):
+        self.cache.clear()
+        self.bytes = 0
+
+def _reports_cache(search):
+    """Copy a CachedSuccessors' hit/miss deltas for this search into its SearchStats.
+    The wrapper keeps search's signature, so its arguments may be passed by keyword."""
+    signature = inspect.signature(search)
+    @functools.wraps(search)
+    def wrapper(*args, **kwargs):
+        successors = signature.bind(*args, **kwargs).arguments["successors"]
+        cached = isinstance(successors, CachedSuccessors)
+        if cached:
+            hits, misses = successors.hits, successors.misses
+        path, stats = search(*args, **kwargs)
+        if cached:
+            stats.cacheHits = successors.hits - hits
+            stats.cacheMisses = successors.misses - misses
+        return path, stats
+    return wrapper
+
+@_reports_cache
+def bfs(start, goalTest, successors, observer=None):
     frontier = deque([(start, [], 0)])  # (state, path, depth)
     explored = set()
     stats = SearchStats()
+    if observer is not None:
+        observer.start("bfs")
+        goalTest = observer.timed("goal", goalTest)
+        successors = observer.timed("successors", successors)
+        frontier = observer.timedDeque(frontier)
+        explored = observer.timedSet()
 
-    while frontier:
-        stats.maxFrontier = max(stats.maxFrontier, len(frontier))
-        state, path, depth = frontier.popleft()
+    try:
+        while frontier:
+            stats.maxFrontier = max(stats.maxFrontier, len(frontier))
+            state, path, depth = frontier.popleft()
 
-        if state in explored:
-            continue
-        explored.add(state)
-        stats.expanded += 1
+            if state in explored:
+                continue
+            explored.add(state)
+            stats.expanded += 1
+            if observer is not None:
+                observer.on_expand(state)
+
+            if goalTest(state):
+                if observer is not None:
+                    observer.on_goal(state, path)
+                return path, stats
+
+            for action, nextState in successors(state):
+                if nextState not in explored:
+                    stats.generated += 1
+                    if observer is not None:
+                        observer.on_generate(state, action, nextState)
+                    frontier.append((nextState, path + [(action, nextState)], depth + 1))
+        return None, stats
+    finally:
+        if observer is not None:
+            observer.finish()
+
+def _shard_worker(index, conn, inboxes, goalTest, successors):
+    """One parallel_bfs worker: owns the visited shard and parent pointers for states with
+    hash(state) % workers == index, and expands the frontier states it owns. Children are
+    put straight into their owner's inbox; only counts and ranks go through the parent."""
+    workers = len(inboxes)
+    parents = {}   # owned state -> (parentState, action), None for the start
+    layer = []     # owned states claimed in the last step, in FIFO order
+    try:
+        while True:
+            msg = conn.recv()
+            command = msg[0]
+            if command == "step":
+                # msg[1]: the rank of each state of layer within the whole layer, in serial FIFO order
+                frontier = list(zip(msg[1], layer))
+                buckets = [[] for _ in range(workers)]
+                for rank, state in frontier:
+                    for i, (action, nextState) in enumerate(successors(state)):
+                        buckets[hash(nextState) % workers].append(((rank, i), nextState, state, action))
+                for j, bucket in enumerate(buckets):
+                    if j != index:
+                        inboxes[j].put(bucket)
+                received = [buckets[index]] + [inboxes[index].get() for _ in range(workers - 1)]
+
+                # Serial bfs keeps the parent it dequeues first, and (parent's rank, successor
+                # index) orders the children the way its FIFO does
+                best = {}
+                for bucket in received:
+                    for key, nextState, state, action in bucket:
+                        if nextState in parents:
+                            continue
+                        old = best.get(nextState)
+                        if old is None or key < old[0]:
+                            best[nextState] = (key, state, action)
+                claimed = sorted(best.items(), key=lambda item: item[1][0])
+                layer = []
+                goal = None
+                for position, (nextState, (_, state, action)) in enumerate(claimed):
+                    parents[nextState] = (state, action)
+                    layer.append(nextState)
+                    if goal is None and goalTest(nextState):
+                        goal = (position, nextState)
+                conn.send((len(frontier), [key for _, (key, _, _) in claimed], goal))
+            elif command == "seed":
+                parents[msg[1]] = None
+                layer = [msg[1]]
+            elif command == "parent":
+                conn.send(parents[msg[1]])
+            else:  # "stop"
+                conn.close()
+                return
+    except Exception as e:
+        # Report instead of dying silently: the parent is waiting on this worker's reply
+        try:
+            conn.send(e)
+        except Exception:
+            conn.send(RuntimeError(f"{type(e).__name__}: {e}"))
+        conn.close()
+
+def _gather(conns):
+    """Every worker's reply, in worker order. Re-raises a worker's exception as soon as it
+    arrives, rather than waiting on workers that may now never answer."""
+    replies = {}
+    pending = list(conns)
+    while pending:
+        for conn in multiprocessing.connection.wait(pending):
+            try:
+                reply = conn.recv()
+            except EOFError:
+                raise RuntimeError("parallel_bfs worker exited unexpectedly") from None
+            if isinstance(reply, Exception):
+                raise reply
+            replies[conn] = reply
+            pending.remove(conn)
+    return [replies[conn] for conn in conns]
 
-        if goalTest(state):
+def _run_layers(start, conns, stats):
+    """Drive the shard workers of parallel_bfs one layer at a time until the goal is found
+    or the frontier empties."""
+    workers = len(conns)
+    owner = hash(start) % workers
+    conns[owner].send(("seed", start))
+    ranks = [[0] if j == owner else [] for j in range(workers)]
+
+    while True:
+        for conn, shardRanks in zip(conns, ranks):
+            conn.send(("step", shardRanks))
+        replies = _gather(conns)
+        stats.expanded += sum(count for count, _, _ in replies)
+
+        # A state's rank is its key's position among the keys of every shard
+        ranks = [[] for _ in range(workers)]
+        keys = [[(key, j) for key in shardKeys] for j, (_, shardKeys, _) in enumerate(replies)]
+        layerSize = 0
+        for layerSize, (_, j) in enumerate(heapq.merge(*keys), 1):
+            ranks[j].append(layerSize - 1)
+        stats.generated += layerSize
+        stats.maxFrontier = max(stats.maxFrontier, layerSize)
+
+        goal = None
+        for j, (_, _, found) in enumerate(replies):
+            if found is not None and (goal is None or ranks[j][found[0]] < goal[0]):
+                goal = (ranks[j][found[0]], found[1])
+        if goal is not None:
+            rank, state = goal
+            stats.expanded += rank + 1   # bfs dequeues the layer in rank order up to the goal
+            path = []
+            while True:
+                conn = conns[hash(state) % workers]
+                conn.send(("parent", state))
+                link = _gather([conn])[0]
+                if link is None:
+                    break
+                prev, action = link
+                path.append((action, state))
+                state = prev
+            path.reverse()
             return path, stats
+        if layerSize == 0:
+            return None, stats
+
+def parallel_bfs(start, goalTest, successors, workers=None):
+    """Layer-synchronous BFS over worker processes.
+
+    Each worker owns the states with hash(state) % workers == its index: their visited
+    shard, their parent pointers and their share of each frontier. Workers expand their
+    frontier states and send the children directly to the owning worker. The parent
+    process only merges each layer's (parent rank, successor index) keys into ranks, so
+    parents are chosen in serial FIFO order and the returned path is the one bfs returns.
+    goalTest and successors are used unchanged; workers are forked, so they need not be
+    picklable. Falls back to bfs where fork is unavailable. An exception raised by goalTest
+    or successors in a worker stops every worker and is re-raised here.
+
+    stats.expanded matches bfs. The other counters are per layer: generated counts each
+    newly reached state once, and maxFrontier is the largest layer. bfs also counts the
+    duplicates it queues, so both are at most bfs's values.
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return bfs(start, goalTest, successors)
+    stats = SearchStats()
+    stats.maxFrontier = 1
+    stats.expanded = 1
+    if goalTest(start):
+        return [], stats
+    stats.expanded = 0
+
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context("fork")
+    inboxes = [context.Queue() for _ in range(workers)]
+    conns, procs = [], []
+    for index in range(workers):
+        parentEnd, childEnd = context.Pipe()
+        proc = context.Process(target=_shard_worker,
+                               args=(index, childEnd, inboxes, goalTest, successors), daemon=True)
+        proc.start()
+        childEnd.close()
+        conns.append(parentEnd)
+        procs.append(proc)
+
+    try:
+        return _run_layers(start, conns, stats)
+    except BaseException:
+        # Other workers may be blocked on an inbox that will never fill
+        for proc in procs:
+            proc.terminate()
+        raise
+    finally:
+        for conn in conns:
+            try:
+                conn.send(("stop",))
+            except OSError:
+                pass   # already terminated
+            conn.close()
+        for proc in procs:
+            proc.join()
+
+def _join_paths(meet, parentsF, parentsB, successors):
+    """Stitch start->meet and meet->goal halves into one list of (action, nextState)."""
+    path = []
+    state = meet
+    while parentsF[state] is not None:
+        prev, action = parentsF[state]
+        path.append((action, state))
+        state = prev
+    path.reverse()
+
+    state = meet
+    while parentsB[state] is not None:
+        nextState, action = parentsB[state]
+        if action is None:
+            # Default predecessors: recover the forward action by re-running successors
+            action = next(a for a, s in successors(state) if s == nextState)
+        path.append((action, nextState))
+        state = nextState
+    return path
+
+def _sum_directions(stats):
+    stats.expanded = stats.forward.expanded + stats.backward.expanded
+    stats.generated = stats.forward.generated + stats.backward.generated
+    stats.maxFrontier = max(stats.forward.maxFrontier, stats.backward.maxFrontier)
 
-        for action, nextState in successors(state):
-            if nextState not in explored:
-                stats.generated += 1
-                frontier.append((nextState, path + [(action, nextState)], depth + 1))
+@_reports_cache
+def bidirectional_bfs(start, goal, successors, predecessors=None):
+    """BFS from both ends, one layer at a time, until the frontiers meet.
+
+    predecessors(state) yields (action, prevState) with prevState --action--> state;
+    without it the domain is assumed reversible. Per-direction counters are in
+    stats.forward and stats.backward.
+    """
+    stats = SearchStats()
+    stats.forward = SearchStats()
+    stats.backward = SearchStats()
+    if start == goal:
+        return [], stats
+
+    if predecessors is None:
+        backward_moves = lambda s: [(None, prev) for _, prev in successors(s)]
+    else:
+        backward_moves = predecessors
+
+    parentsF = {start: None}  # state -> (prevState, action)
+    parentsB = {goal: None}   # state -> (nextState, action toward goal)
+    frontierF = [start]
+    frontierB = [goal]
+    distF = {start: 0}
+    distB = {goal: 0}
+
+    while frontierF and frontierB:
+        # Grow the smaller side; a layer is finished before checking for the best meeting
+        forward = len(frontierF) <= len(frontierB)
+        if forward:
+            frontier, moves, parents, dist, other, side = frontierF, successors, parentsF, distF, distB, stats.forward
+        else:
+            frontier, moves, parents, dist, other, side = frontierB, backward_moves, parentsB, distB, distF, stats.backward
+        side.maxFrontier = max(side.maxFrontier, len(frontier))
+
+        nextLayer = []
+        best = None
+        for state in frontier:
+            side.expanded += 1
+            for action, neighbor in moves(state):
+                if neighbor in parents:
+                    continue
+                side.generated += 1
+                parents[neighbor] = (state, action)
+                dist[neighbor] = dist[state] + 1
+                nextLayer.append(neighbor)
+                if neighbor in other:
+                    total = dist[neighbor] + other[neighbor]
+                    if best is None or total < best[0]:
+                        best = (total, neighbor)
+
+        if forward:
+            frontierF = nextLayer
+        else:
+            frontierB = nextLayer
+
+        if best is not None:
+            _sum_directions(stats)
+            return _join_paths(best[1], parentsF, parentsB, successors), stats
+
+    _sum_directions(stats)
     return None, stats
 
-def dls(state, goalTest, successors, limit, path, stats, visited):
-    """Recursive depth-limited search used by IDS."""
-    if goalTest(state):
-        return path, True
+def _remember_failure(failed, table_size, state, remaining):
+    """Record that no goal lies within `remaining` steps of state, evicting the oldest entry."""
+    if failed.get(state, -1) >= remaining:
+        return
+    if state not in failed and len(failed) >= table_size:
+        del failed[next(iter(failed))]
+    failed[state] = remaining
+
+def _dls_stack(start, goalTest, successors, limit, stats, failed, table_size, observer=None):
+    """Depth-limited DFS on explicit stacks; one shared path is pushed and popped in place."""
+    if goalTest(start):
+        return [], False
     if limit == 0:
-        return None, False
+        return None, True
 
-    visited.add(state)
-    cutoffOccurred = False
+    path = []                       # (action, state) for every frame above the root
+    nodes = [start]
+    children = [successors(start)]
+    cursors = [0]
+    onPath = {start} if observer is None else observer.timedSet()
+    onPath.add(start)
     stats.expanded += 1
+    if observer is not None:
+        observer.on_expand(start)
+    stats.maxFrontier = max(stats.maxFrontier, 1)
+    cutoffOccurred = False
 
-    for action, nextState in successors(state):
+    while nodes:
+        top = len(nodes) - 1
+        kids = children[top]
+        i = cursors[top]
+        if i == len(kids):
+            # Subtree exhausted without reaching the goal
+            state = nodes.pop()
+            children.pop()
+            cursors.pop()
+            onPath.discard(state)
+            if path:
+                path.pop()
+            if table_size:
+                _remember_failure(failed, table_size, state, limit - top)
+            continue
+        cursors[top] = i + 1
+
+        action, nextState = kids[i]
         stats.generated += 1
-        if nextState not in visited:
-            result, cutoff = dls(nextState, goalTest, successors, limit - 1,
-                                 path + [(action, nextState)], stats, visited)
-            if result is not None:
-                return result, True
-            if cutoff:
-                cutoffOccurred = True
-    visited.remove(state)
+        if observer is not None:
+            observer.on_generate(nodes[top], action, nextState)
+        if nextState in onPath:
+            continue
+        remaining = limit - top - 1
+        if table_size and failed.get(nextState, -1) >= remaining:
+            cutoffOccurred = True   # the pruned subtree may have been cut off
+            continue
+        if goalTest(nextState):
+            path.append((action, nextState))
+            return path, False
+        if remaining == 0:
+            cutoffOccurred = True
+            continue
+
+        path.append((action, nextState))
+        nodes.append(nextState)
+        children.append(successors(nextState))
+        cursors.append(0)
+        onPath.add(nextState)
+        stats.expanded += 1
+        if observer is not None:
+            observer.on_expand(nextState)
+        stats.maxFrontier = max(stats.maxFrontier, len(nodes))
+
     return None, cutoffOccurred
 
-def ids(start, goal_test, successors, max_depth=50):
+@_reports_cache
+def ids(start, goal_test, successors, max_depth=50, table_size=0, observer=None):
+    """Iterative deepening without recursion.
+
+    table_size > 0 enables a bounded transposition table remembering, per state, the
+    largest remaining depth already proven to fail, so those subtrees are skipped in
+    later visits and iterations. stats.maxFrontier is the peak DFS stack depth.
+    """
     stats = SearchStats()
-    for depth in range(max_depth + 1):
-        result, found = dls(start, goal_test, successors, depth, [], stats, set())
-        stats.maxFrontier = max(stats.maxFrontier, len(stats.__dict__))
-        if result is not None:
-            return result, stats
-    return None, stats
+    failed = {}
+    if observer is not None:
+        observer.start("ids")
+        goal_test = observer.timed("goal", goal_test)
+        successors = observer.timed("successors", successors)
+    try:
+        for depth in range(max_depth + 1):
+            result, cutoff = _dls_stack(start, goal_test, successors, depth, stats, failed,
+                                        table_size, observer)
+            if result is not None:
+                if observer is not None:
+                    observer.on_goal(result[-1][1] if result else start, result)
+                return result, stats
+            if not cutoff:
+                break   # the whole reachable space was searched
+        return None, stats
+    finally:
+        if observer is not None:
+            observer.finish()
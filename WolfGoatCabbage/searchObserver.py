@@ -0,0 +1,116 @@
+import json
+import time
+from collections import defaultdict, deque
+
+class SearchObserver:
+    """Callbacks and cumulative per-phase timers for the search engines.
+
+    Pass an instance as `observer=` to bfs/ids. Engines only instrument themselves
+    when an observer is given, so searches without one run the untouched fast path.
+    Override on_expand/on_generate/on_goal for custom hooks; call super() to keep
+    the counters. A*andHeuristicSearch/searchObserver.py gives AStar the same hooks
+    and export; each copy only carries the timed containers its own engines use.
+    """
+    def __init__(self):
+        self.engine = None
+        self.phaseSeconds = defaultdict(float)
+        self.phaseCalls = defaultdict(int)
+        self.counts = {"expand": 0, "generate": 0, "goal": 0}
+        self.totalSeconds = 0.0
+        self._startTime = None
+
+    # --- hooks ---
+    def on_expand(self, state):
+        self.counts["expand"] += 1
+
+    def on_generate(self, state, action, nextState):
+        self.counts["generate"] += 1
+
+    def on_goal(self, state, path):
+        self.counts["goal"] += 1
+
+    # --- timing ---
+    def start(self, engine):
+        self.engine = engine
+        self._startTime = time.perf_counter()
+
+    def finish(self):
+        if self._startTime is not None:
+            self.totalSeconds += time.perf_counter() - self._startTime
+            self._startTime = None
+
+    def timed(self, phase, fn):
+        """Wrap fn so every call adds its duration to `phase`."""
+        clock, record = _clocked(self, phase)
+        def wrapper(*args):
+            t = clock()
+            try:
+                return fn(*args)
+            finally:
+                record(t)
+        return wrapper
+
+    def timedSet(self, phase="duplicates"):
+        return _TimedSet(self, phase)
+
+    def timedDeque(self, items=(), phase="frontier"):
+        return _TimedDeque(self, phase, items)
+
+    # --- export ---
+    def to_dict(self):
+        measured = sum(self.phaseSeconds.values())
+        return {
+            "engine": self.engine,
+            "totalSeconds": self.totalSeconds,
+            "nodesPerSecond": self.counts["expand"] / self.totalSeconds if self.totalSeconds else 0.0,
+            "counts": dict(self.counts),
+            "phases": {phase: {"seconds": self.phaseSeconds[phase], "calls": self.phaseCalls[phase]}
+                       for phase in sorted(self.phaseSeconds)},
+            "unattributedSeconds": max(0.0, self.totalSeconds - measured),
+        }
+
+    def to_json(self, path=None):
+        text = json.dumps(self.to_dict(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return text
+
+def _clocked(observer, phase):
+    seconds, calls, clock = observer.phaseSeconds, observer.phaseCalls, time.perf_counter
+    def record(t):
+        seconds[phase] += clock() - t
+        calls[phase] += 1
+    return clock, record
+
+class _TimedSet(set):
+    def __init__(self, observer, phase):
+        super().__init__()
+        self._clock, self._record = _clocked(observer, phase)
+
+    def __contains__(self, item):
+        t = self._clock()
+        found = set.__contains__(self, item)
+        self._record(t)
+        return found
+
+    def add(self, item):
+        t = self._clock()
+        set.add(self, item)
+        self._record(t)
+
+class _TimedDeque(deque):
+    def __init__(self, observer, phase, items=()):
+        super().__init__(items)
+        self._clock, self._record = _clocked(observer, phase)
+
+    def append(self, item):
+        t = self._clock()
+        deque.append(self, item)
+        self._record(t)
+
+    def popleft(self):
+        t = self._clock()
+        item = deque.popleft(self)
+        self._record(t)
+        return item
@@ -0,0 +1,8 @@
+from benchmark import percentile
+
+def test_percentile_is_nearest_rank():
+    assert percentile(list(range(6)), 50) == 2
+    assert percentile(list(range(10)), 90) == 8
+    assert percentile(list(range(10)), 99) == 9
+    assert percentile(list(range(10)), 0) == 0
+    assert percentile([7], 50) == 7
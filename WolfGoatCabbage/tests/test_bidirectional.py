@@ -0,0 +1,40 @@
+from wgc import initialState, goalState, successors
+from searchCore import bfs, bidirectional_bfs
+
+def test_bidirectional_matches_bfs_length():
+    start, goal = initialState(), goalState()
+    path, stats = bidirectional_bfs(start, goal, successors)
+    bfs_path, _ = bfs(start, lambda s: s == goal, successors)
+
+    assert path is not None
+    assert len(path) == len(bfs_path)
+    assert stats.expanded == stats.forward.expanded + stats.backward.expanded
+    assert stats.forward.expanded > 0 and stats.backward.expanded > 0
+
+def test_bidirectional_path_is_replayable():
+    start, goal = initialState(), goalState()
+    path, _ = bidirectional_bfs(start, goal, successors)
+
+    current = start
+    for action, state in path:
+        assert (action, state) in successors(current)
+        current = state
+    assert current == goal
+
+def test_bidirectional_start_is_goal():
+    path, stats = bidirectional_bfs(goalState(), goalState(), successors)
+    assert path == []
+    assert stats.expanded == 0
+
+def test_bidirectional_with_explicit_predecessors():
+    # Irreversible domain: n -> n+1 or 2n, searched from 1 to 10
+    succ = lambda n: [("inc", n + 1), ("dbl", 2 * n)] if n < 20 else []
+    pred = lambda n: [("inc", n - 1)] + ([("dbl", n // 2)] if n % 2 == 0 else [])
+    path, _ = bidirectional_bfs(1, 10, succ, pred)
+
+    assert len(path) == len(bfs(1, lambda n: n == 10, succ)[0])
+    current = 1
+    for action, state in path:
+        assert (action, state) in succ(current)
+        current = state
+    assert current == 10
@@ -0,0 +1,33 @@
+from wgc import initialState, goalState, successors
+from searchCore import bfs, ids
+
+def grid_successors(state, size=6):
+    x, y = state
+    moves = (("R", (1, 0)), ("L", (-1, 0)), ("U", (0, 1)), ("D", (0, -1)))
+    return [(name, (x + dx, y + dy)) for name, (dx, dy) in moves
+            if 0 <= x + dx < size and 0 <= y + dy < size]
+
+def test_ids_matches_bfs_depth_with_and_without_table():
+    goal_test = lambda s: s == goalState()
+    bfs_path, _ = bfs(initialState(), goal_test, successors)
+    for table_size in (0, 64):
+        path, stats = ids(initialState(), goal_test, successors, table_size=table_size)
+        assert len(path) == len(bfs_path)
+        assert stats.maxFrontier <= len(path)
+
+def test_ids_does_not_recurse_on_deep_chains():
+    chain = lambda n: [("inc", n + 1)] if n < 2000 else []
+    path, stats = ids(0, lambda n: n == 1200, chain, max_depth=1500)
+    assert len(path) == 1200
+    assert stats.maxFrontier == 1200
+
+def test_transposition_table_prunes_repeated_subtrees():
+    goal_test = lambda s: s == (5, 5)
+    plain_path, plain = ids((0, 0), goal_test, grid_successors, max_depth=20)
+    tt_path, tt = ids((0, 0), goal_test, grid_successors, max_depth=20, table_size=1000)
+    assert len(plain_path) == len(tt_path) == 10
+    assert tt.expanded < plain.expanded
+
+def test_ids_stops_once_space_is_exhausted():
+    path, stats = ids((0, 0), lambda s: s == (9, 9), grid_successors, max_depth=40, table_size=1000)
+    assert path is None
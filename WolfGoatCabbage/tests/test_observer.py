@@ -0,0 +1,48 @@
+import json
+
+from wgc import initialState, goalState, successors
+from searchCore import bfs, ids
+from searchObserver import SearchObserver
+
+def goal_test(s):
+    return s == goalState()
+
+def test_bfs_observer_counts_match_stats():
+    observer = SearchObserver()
+    path, stats = bfs(initialState(), goal_test, successors, observer=observer)
+    plain_path, plain_stats = bfs(initialState(), goal_test, successors)
+
+    assert path == plain_path
+    assert observer.counts == {"expand": stats.expanded, "generate": stats.generated, "goal": 1}
+    assert stats.expanded == plain_stats.expanded
+    assert set(observer.phaseSeconds) == {"successors", "goal", "duplicates", "frontier"}
+    assert observer.phaseCalls["goal"] == stats.expanded
+
+def test_ids_observer_counts_match_stats():
+    observer = SearchObserver()
+    path, stats = ids(initialState(), goal_test, successors, observer=observer)
+
+    assert path == ids(initialState(), goal_test, successors)[0]
+    assert observer.counts["expand"] == stats.expanded
+    assert observer.counts["generate"] == stats.generated
+    assert observer.engine == "ids"
+
+def test_custom_hooks_and_json_export(tmp_path):
+    class Recorder(SearchObserver):
+        def __init__(self):
+            super().__init__()
+            self.expanded = []
+
+        def on_expand(self, state):
+            super().on_expand(state)
+            self.expanded.append(state)
+
+    observer = Recorder()
+    bfs(initialState(), goal_test, successors, observer=observer)
+    assert observer.expanded[0] == initialState()
+
+    out = tmp_path / "profile.json"
+    report = json.loads(observer.to_json(str(out)))
+    assert report == json.loads(out.read_text())
+    assert report["engine"] == "bfs"
+    assert report["totalSeconds"] >= sum(p["seconds"] for p in report["phases"].values())
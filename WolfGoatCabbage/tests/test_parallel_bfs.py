@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from wgc import initialState, goalState, successors
+from riverCrossing import randomInstance
+from searchCore import bfs, parallel_bfs
+
+def test_parallel_bfs_matches_serial_on_wgc():
+    goal_test = lambda s: s == goalState()
+    path, stats = parallel_bfs(initialState(), goal_test, successors, workers=2)
+    serial_path, serial_stats = bfs(initialState(), goal_test, successors)
+    assert path == serial_path
+    assert stats.expanded == serial_stats.expanded
+
+def test_parallel_bfs_matches_serial_on_river_crossing():
+    domain = randomInstance(12, seed=1)
+    goal_test = lambda s: s == domain.goalState()
+    for workers in (1, 3):
+        path, _ = parallel_bfs(domain.initialState(), goal_test, domain.successors, workers=workers)
+        assert path == bfs(domain.initialState(), goal_test, domain.successors)[0]
+
+def random_graph(nodes, edges, seed):
+    rng = random.Random(seed)
+    graph = {n: [] for n in range(nodes)}
+    for _ in range(edges):
+        a, b = rng.randrange(nodes), rng.randrange(nodes)
+        graph[a].append((f"{a}->{b}", b))
+    return lambda n: graph[n]
+
+def test_parallel_bfs_counters_on_random_graphs():
+    # Same-layer edges and repeated children make bfs queue duplicates, which parallel_bfs
+    # never counts; expansions must still agree
+    for seed in range(20):
+        succ = random_graph(60, 150, seed)
+        goal_test = lambda n: n == 59
+        serial_path, serial_stats = bfs(0, goal_test, succ)
+        for workers in (1, 2, 3):
+            path, stats = parallel_bfs(0, goal_test, succ, workers=workers)
+            assert path == serial_path
+            assert stats.expanded == serial_stats.expanded
+            assert stats.generated <= serial_stats.generated
+            assert stats.maxFrontier <= serial_stats.maxFrontier
+
+def test_parallel_bfs_reports_unreachable_goal():
+    path, stats = parallel_bfs(initialState(), lambda s: False, successors, workers=2)
+    _, serial_stats = bfs(initialState(), lambda s: False, successors)
+    assert path is None
+    assert stats.expanded == serial_stats.expanded
+    assert stats.generated == stats.expanded - 1   # every reachable state but the start, once
+
+def test_parallel_bfs_reraises_worker_errors():
+    # 37 is a few layers from 0, so the failure happens inside a worker
+    succ = lambda n: [("inc", n + 1), ("double", 2 * n)] if n < 100 else []
+    target = 37
+    def failing(n):
+        if n == target:
+            raise KeyError("no successors")
+        return succ(n)
+    def failing_goal(n):
+        if n == target:
+            raise ValueError("bad state")
+        return False
+    for workers in (1, 3):
+        with pytest.raises(KeyError, match="no successors"):
+            parallel_bfs(0, lambda n: False, failing, workers=workers)
+        with pytest.raises(ValueError, match="bad state"):
+            parallel_bfs(0, failing_goal, succ, workers=workers)
@@ -0,0 +1,36 @@
+from itertools import product
+
+from wgc import State, LEFT, RIGHT, isValid, successors
+from riverCrossing import RiverCrossing, wolfGoatCabbage, fromWGCState, randomInstance
+from searchCore import bfs, ids
+
+def test_wgc_special_case_matches_wgc_module():
+    domain = wolfGoatCabbage()
+    for sides in product((LEFT, RIGHT), repeat=4):
+        state = State(*sides)
+        packed = fromWGCState(state)
+        assert domain.isValid(packed) == isValid(state)
+        if isValid(state):
+            expected = sorted(fromWGCState(s) for _, s in successors(state))
+            assert sorted(s for _, s in domain.successors(packed)) == expected
+
+def test_wgc_special_case_solves_in_seven_crossings():
+    domain = wolfGoatCabbage()
+    goal_test = lambda s: s == domain.goalState()
+    path, _ = bfs(domain.initialState(), goal_test, domain.successors)
+    assert len(path) == 7
+    path, _ = ids(domain.initialState(), goal_test, domain.successors, max_depth=10)
+    assert len(path) == 7
+
+def test_boat_capacity_limits_loads():
+    domain = RiverCrossing(["A", "B", "C"], capacity=2)
+    loads = [action for action, _ in domain.successors(domain.initialState())]
+    assert "Take A & B" in loads
+    assert not any(action.count("&") > 1 for action in loads)
+
+def test_random_instance_is_seeded_and_solvable():
+    a = randomInstance(10, seed=3)
+    b = randomInstance(10, seed=3)
+    assert a.conflictMasks == b.conflictMasks
+    path, _ = bfs(a.initialState(), lambda s: s == a.goalState(), a.successors)
+    assert path is not None
@@ -0,0 +1,43 @@
+from wgc import initialState, goalState, successors
+from searchCore import CachedSuccessors, bfs, bidirectional_bfs, ids
+
+def test_cache_counts_hits_and_misses_in_stats():
+    cached = CachedSuccessors(successors)
+    goal_test = lambda s: s == goalState()
+    path, stats = ids(initialState(), goal_test, cached)
+    plain_path, _ = ids(initialState(), goal_test, successors)
+
+    assert path == plain_path
+    assert stats.cacheHits > 0
+    assert stats.cacheHits + stats.cacheMisses == cached.hits + cached.misses
+
+def test_uncached_search_reports_no_cache_activity():
+    _, stats = bfs(initialState(), lambda s: s == goalState(), successors)
+    assert stats.cacheHits == stats.cacheMisses == 0
+
+def test_lru_evicts_least_recently_used():
+    calls = []
+    def succ(n):
+        calls.append(n)
+        return [("inc", n + 1)]
+    cached = CachedSuccessors(succ, max_entries=2)
+    cached(1); cached(2); cached(1); cached(3)   # 2 is least recently used
+    assert list(cached.cache) == [1, 3]
+    cached(2)
+    assert calls == [1, 2, 3, 2]
+    assert cached.evictions == 2
+
+def test_byte_cap_bounds_cache_size():
+    cached = CachedSuccessors(lambda n: [("inc", n + 1)], max_entries=10**6, max_bytes=2000)
+    for n in range(1000):
+        cached(n)
+    assert 0 < cached.bytes <= 2000
+
+def test_engines_accept_keyword_arguments():
+    goal = goalState()
+    cached = CachedSuccessors(successors)
+    path, _ = bfs(initialState(), goalTest=lambda s: s == goal, successors=successors)
+    ids_path, stats = ids(start=initialState(), goal_test=lambda s: s == goal, successors=cached)
+    bidir_path, _ = bidirectional_bfs(initialState(), goal=goal, successors=successors)
+    assert len(path) == len(ids_path) == len(bidir_path)
+    assert stats.cacheMisses > 0
@@ -5,6 +5,7 @@ from collections import namedtuple
 State = namedtuple("State", ["B", "W", "G", "C"])
 
 LEFT, RIGHT = "L", "R"
+OPPOSITE = {LEFT: RIGHT, RIGHT: LEFT}
 
 def initialState():
     return State(RIGHT, LEFT, LEFT, RIGHT)
@@ -25,10 +26,9 @@ def isValid(state: State) -> bool:
 def successors(state: State):
     """Generate valid next states with action descriptions."""
     moves = []
-    opposite = {LEFT: RIGHT, RIGHT: LEFT}
 
     # Boat always moves
-    newB = opposite[state.B]
+    newB = OPPOSITE[state.B]
 
     # Boat moves alone
     newState = State(newB, state.W, state.G, state.C)